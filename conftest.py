@@ -1,35 +1,98 @@
 import pytest
-import os
-import sys
-from pathlib import Path
 
-# Add src directory to Python path
-project_root = Path(__file__).parent
-src_dir = str(project_root / "src")
-if src_dir not in sys.path:
-    sys.path.insert(0, src_dir)
-
-# Configure pytest-asyncio
+# Configure pytest-asyncio (loop scopes are set in pytest.ini)
 pytest_plugins = ('pytest_asyncio',)
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session"""
-    import asyncio
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-@pytest.fixture(autouse=True)
-def setup_test_env():
-    """Set up test environment variables"""
-    os.environ['OPENAI_API_KEY'] = 'test-key'
-    os.environ['GPT_ANALYSIS_CACHE_PATH'] = '/tmp/test_cache'
-    os.environ['MAX_GPT_CALLS'] = '5'
-    os.environ['GPT_CACHE_TTL'] = '3600'
-    os.environ['MARKET_CACHE_TTL'] = '3600'
-    os.environ['MIN_POPULAR_SCORE'] = '5.0'
-    yield
-    # Clean up
-    if 'OPENAI_API_KEY' in os.environ:
-        del os.environ['OPENAI_API_KEY']
+def pytest_addoption(parser):
+    parser.addoption("--runslow", action="store_true", default=False,
+                     help="also run tests marked slow (full CodeAnalyzer pipeline runs)")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: end-to-end analysis, skipped unless --runslow is given")
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --runslow is given"""
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test, run with --runslow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+@pytest.fixture
+def temp_repo(tmp_path_factory):
+    """Fresh repository directory for one test, cleaned up by pytest"""
+    return str(tmp_path_factory.mktemp("repo"))
+
+@pytest.fixture
+def temp_cache_dir(tmp_path_factory):
+    """Fresh cache directory for one test, cleaned up by pytest"""
+    return str(tmp_path_factory.mktemp("cache"))
+
+@pytest.fixture(autouse=True, scope="session")
+def setup_test_env(tmp_path_factory):
+    """
+    Set up test environment variables once for the whole session. The cache lives
+    in the session's own temporary directory, so parallel workers never share it
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('OPENAI_API_KEY', 'test-key')
+        mp.setenv('GPT_ANALYSIS_CACHE_PATH', str(tmp_path_factory.mktemp("gpt_cache")))
+        mp.setenv('MAX_GPT_CALLS', '5')
+        mp.setenv('GPT_CACHE_TTL', '3600')
+        mp.setenv('MIN_POPULAR_SCORE', '5.0')
+        yield
+
+# Canned replies of the gpt_client fixture
+CODE_ANALYSIS_REPLY = {
+    'ai_score': 0.8,
+    'quality_score': 0.7,
+    'originality_score': 0.9,
+    'execution_score': 0.6,
+    'market_value': 0.85,
+    'findings': ["Good AI implementation"],
+    'recommendations': ["Consider optimizing further"]
+}
+MARKET_ANALYSIS_REPLY = {
+    'popularity_score': 0.85,
+    'adoption_score': 0.80,
+    'impact_score': 0.75,
+    'popularity_metrics': {'stars': 1200, 'forks': 150, 'watchers': 300},
+    'community_metrics': {'contributors': 25, 'issues': 150, 'pull_requests': 200},
+    'market_context': "Strong community engagement and adoption",
+    'recommendations': ["Consider enterprise support options"]
+}
+
+@pytest.fixture
+def gpt_client():
+    """
+    Stand-in OpenAI client answering every request with canned analyses, for
+    CodeAnalyzer(..., gpt_client=...) and MarketAnalyzer(gpt_client=...)
+    """
+    import json
+    from types import SimpleNamespace
+    from analyzer.gpt_analyzer import FULL_ANALYSIS_PROMPT
+    
+    async def create(model, messages, **kwargs):
+        user_content = messages[-1]['content']
+        if "market success" in user_content.lower():
+            content = MARKET_ANALYSIS_REPLY
+        elif user_content.startswith('['):
+            # Multi-segment request: one analysis per segment id
+            content = {'results': [dict(CODE_ANALYSIS_REPLY, id=segment['id'])
+                                   for segment in json.loads(user_content)]}
+        elif messages[0]['content'] == FULL_ANALYSIS_PROMPT:
+            # Combined request: analysis, verification and originality
+            content = {
+                'analysis': CODE_ANALYSIS_REPLY,
+                'verification': {'is_real_ai': True, 'implementation_type': 'framework', 'confidence': 0.8,
+                                 'evidence': ["Uses ML framework APIs"], 'suggestions': []},
+                'originality': {'originality_score': 0.9, 'is_likely_copied': False, 'common_patterns': [],
+                                'unique_elements': ["Custom model code"], 'recommendations': []}
+            }
+        else:
+            content = CODE_ANALYSIS_REPLY
+        message = SimpleNamespace(content=json.dumps(content))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+    
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
@@ -0,0 +1,9 @@
+"""
+Make the src/ packages importable for scripts run straight from a checkout
+"""
+import os
+import sys
+
+_SRC = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
@@ -0,0 +1,11 @@
+"""
+Process-wide .env loading shared by the analysis scripts
+"""
+from functools import lru_cache
+from typing import Optional
+from dotenv import load_dotenv
+
+@lru_cache(maxsize=None)
+def ensure_env(env_path: Optional[str] = None) -> bool:
+    """Load environment variables from .env exactly once per process"""
+    return load_dotenv(env_path)
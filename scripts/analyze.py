@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+import os
+import sys
+import argparse
+from datetime import datetime
+
+# Make the src directory importable
+import _bootstrap  # noqa: F401
+
+AI_COMPONENT = ("AI Framework Implementation", "ai_framework_score",
+                "AI model integration, prompt engineering, context handling")
+CODE_COMPONENT = ("Code Quality & Patterns", "code_quality_score",
+                  "AI-specific patterns, documentation, error handling")
+EXECUTION_COMPONENT = ("Execution & Performance", "execution_score",
+                       "Runtime efficiency, resource management, reliability")
+SECURITY_COMPONENT = ("Security Measures", "security_score",
+                      "Input validation, API security, model output handling")
+MARKET_COMPONENT = ("Market Success", "market_value_score",
+                    "Project popularity, community adoption, market impact")
+# Originality is reported from the security score
+ORIGINALITY_COMPONENT = ("Code Originality", "security_score",
+                         "Code uniqueness, implementation originality, framework customization")
+
+SECURITY_REPORT = {
+    'component_labels': (AI_COMPONENT, CODE_COMPONENT, EXECUTION_COMPONENT, SECURITY_COMPONENT),
+    'weight_distribution': "30/30/30/10 (AI/Code/Execution/Security)",
+}
+MARKET_REPORT = {
+    'component_labels': (AI_COMPONENT, CODE_COMPONENT, EXECUTION_COMPONENT,
+                         MARKET_COMPONENT, ORIGINALITY_COMPONENT),
+    'weight_distribution': "30/20/20/20/10 (Market/AI/Code/Execution/Originality)",
+}
+
+INTERPRETATION_GUIDE = (
+    "9.0-10.0: Exceptional - Production-ready AI implementation",
+    "7.5-8.9:  Strong     - Well-implemented with minor improvements needed",
+    "6.0-7.4:  Good       - Solid foundation with room for enhancement",
+    "4.0-5.9:  Fair       - Basic implementation, needs significant work",
+    "0.0-3.9:  Limited    - Major improvements required",
+)
+
+REPOS = {
+    'aether': {
+        'title': "Aether Framework",
+        'env_var': 'AETHER_REPO',
+        'repo_url': 'https://github.com/AetherFrameworkAI/aether-framework',
+        **SECURITY_REPORT,
+        'issues_heading': "Areas for Improvement",
+        'recommendations_heading': "Enhancement Recommendations",
+        'interpretation_guide': True,
+    },
+    'aios': {
+        'title': "AIOS",
+        'env_var': 'AIOS_REPO',
+        'repo_url': 'https://github.com/agiresearch/AIOS',
+        **MARKET_REPORT,
+    },
+    'eliza': {
+        'title': "Eliza",
+        'env_var': 'ELIZA_REPO',
+        'repo_url': 'https://github.com/elizaos/eliza',
+        **MARKET_REPORT,
+    },
+    'rig': {
+        'title': "Rig",
+        'env_var': 'RIG_REPO',
+        'repo_url': 'https://github.com/0xPlaygrounds/rig',
+        **MARKET_REPORT,
+    },
+    'swarms': {
+        'title': "Swarms Platform",
+        'env_var': 'SWARMS_REPO',
+        'repo_url': 'https://github.com/The-Swarm-Corporation/swarms-platform',
+        **SECURITY_REPORT,
+    },
+}
+
+COMPONENT_TEMPLATE = """{index}. {label}
+   Score: {score:.1f}/10
+   Evaluates: {evaluates}"""
+
+REPORT_TEMPLATE = """## Chron AI Analysis Results
+
+### Component Scores (0-10 scale)
+{components}
+
+### Overall Project Score
+Final Score: {overall:.1f}/10
+Weight Distribution: {weights}
+
+"""
+
+
+def format_report(result, config):
+    """Render the component scores, overall score and findings for a result"""
+    components = "\n\n".join(
+        COMPONENT_TEMPLATE.format(index=index, label=label,
+                                  score=getattr(result, attr) * 10, evaluates=evaluates)
+        for index, (label, attr, evaluates) in enumerate(config['component_labels'], 1)
+    )
+    sections = [REPORT_TEMPLATE.format(
+        components=components,
+        overall=result.calculate_overall_score() * 10,
+        weights=config['weight_distribution'],
+    )]
+
+    if result.issues:
+        sections.append(f"### {config.get('issues_heading', 'Issues Identified')}\n")
+        sections.append("\n".join(f"- {issue}" for issue in result.issues) + "\n\n")
+
+    if result.recommendations:
+        sections.append(f"### {config.get('recommendations_heading', 'Recommendations')}\n")
+        sections.append("\n".join(f"- {rec}" for rec in result.recommendations) + "\n\n")
+
+    if config.get('interpretation_guide'):
+        sections.append("### Score Interpretation Guide\n")
+        sections.append("\n".join(INTERPRETATION_GUIDE) + "\n\n")
+
+    return "".join(sections)
+
+
+def print_report(result, config):
+    """Write the whole report to stdout in one call"""
+    sys.stdout.write(format_report(result, config))
+
+
+async def analyze(name):
+    """Analyze one configured repository using Chron AI analyzer"""
+    # Deferred so a failing run or --help doesn't pay for dotenv and the analyzer stack
+    from _env import ensure_env
+    from analyzer import CodeAnalyzer
+
+    ensure_env()
+    config = REPOS[name]
+
+    try:
+        print(f"\nStarting {config['title']} Analysis...")
+        print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+        repo_url = os.getenv(config['env_var'], config['repo_url'])
+        analyzer = CodeAnalyzer(repo_url)
+        try:
+            result = await analyzer.analyze()
+        finally:
+            analyzer.cleanup()
+
+        print_report(result, config)
+        print("Analysis completed successfully.")
+        return 0
+
+    except Exception as e:
+        print(f"\nError during analysis: {str(e)}", file=sys.stderr)
+        return 1
+
+
+def run(name):
+    """Run the analysis for a configured repository and return its exit code"""
+    import asyncio
+    import logging
+
+    # Library modules only log; the entrypoint decides where and what
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    return asyncio.run(analyze(name))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a known repository with Chron AI")
+    parser.add_argument('--repo', required=True, choices=sorted(REPOS),
+                        help="Repository configuration to analyze")
+    args = parser.parse_args(argv)
+    return run(args.repo)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,8 @@
 #!/usr/bin/env python3
-import os
 import sys
-from pathlib import Path
 
-# Add project root to Python path
-project_root = str(Path(__file__).parent.parent)
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
+# Make the src directory importable
+import _bootstrap  # noqa: F401
 
 def test_imports():
     """Test importing all analyzer modules"""
@@ -2,18 +2,17 @@
 import sys
 from pathlib import Path
 import os
-from dotenv import load_dotenv
+from _env import ensure_env
 
-# Add the src directory to Python path
-src_dir = str(Path(__file__).parent.parent / "src")
-sys.path.append(src_dir)
+# Make the src directory importable
+import _bootstrap  # noqa: F401
 
 # Load environment variables from .env file
 env_path = Path(__file__).parent.parent / ".env"
 if not env_path.exists():
     print(f"Error: .env file not found at {env_path}")
     sys.exit(1)
-load_dotenv(env_path)
+ensure_env(str(env_path))
 
 def verify_environment():
     """Verify that all required components are available"""
@@ -1,26 +1,47 @@
+import os
+
 from setuptools import setup, find_packages
 
+# Opt-in ahead-of-time compilation of the authenticity scoring hot loop:
+#   CHRONAI_MYPYC=1 pip install .
+# Without it the pure-Python module is installed and used as-is.
+ext_modules = []
+if os.environ.get("CHRONAI_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify(["src/analyzer/authenticity_detector.py"])
+
 setup(
     name="chronai",
     version="0.1.0",
     description="AI Project Analysis Tool",
     author="Chronai Team",
     author_email="team@chronai.ai",
-    packages=find_packages(),
+    package_dir={"": "src"},
+    packages=find_packages("src"),
+    package_data={"analyzer": ["py.typed"]},
+    ext_modules=ext_modules,
     install_requires=[
         "gitpython>=3.1.40",
         "pydantic>=2.4.2",
-        "pytest>=7.4.3",
-        "pytest-asyncio>=0.21.1",
+        "pytest>=8.2",
+        "pytest-asyncio>=0.26",
         "radon>=6.0.1",
         "pylint>=3.0.2",
         "mypy>=1.7.0",
         "tensorflow-hub>=0.15.0",
         "torch>=2.2.0",
         "transformers>=4.35.2",
-        "openai>=1.12.0",
+        "openai>=1.17.0",
         "solana>=0.30.2",
         "anchorpy>=0.18.0",
     ],
-    python_requires=">=3.8",
+    extras_require={
+        # Optional accelerators, the analyzers fall back to the stdlib without them
+        "speedups": [
+            "hyperscan>=0.4.0",
+            "numba>=0.59",
+            "orjson>=3.9",
+        ],
+    },
+    python_requires=">=3.10",
 )
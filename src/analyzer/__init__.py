@@ -3,27 +3,33 @@ Chronai AI Project Analysis Tool - Core Analyzer Package
 """
 import logging
 import asyncio
+import importlib
 
-from .code_analyzer import CodeAnalyzer, AnalysisResult
-from .authenticity_detector import AuthenticityDetector
-from .execution_verifier import ExecutionVerifier
-from .report_generator import ReportGenerator, Report
-from .gpt_analyzer import GPTAnalyzer
-from .market_analyzer import MarketAnalyzer
+# Public names and the submodule that defines them. Submodules pull in heavy
+# dependencies (openai, radon, git), so they are only imported on first access.
+_LAZY = {
+    'CodeAnalyzer': 'code_analyzer',
+    'AnalysisResult': 'code_analyzer',
+    'AuthenticityDetector': 'authenticity_detector',
+    'ExecutionVerifier': 'execution_verifier',
+    'ReportGenerator': 'report_generator',
+    'Report': 'report_generator',
+    'GPTAnalyzer': 'gpt_analyzer',
+    'MarketAnalyzer': 'market_analyzer'
+}
 
-__all__ = [
-    'CodeAnalyzer',
-    'AnalysisResult',
-    'AuthenticityDetector',
-    'ExecutionVerifier',
-    'ReportGenerator',
-    'Report',
-    'GPTAnalyzer',
-    'MarketAnalyzer'
-]
+__all__ = list(_LAZY)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+def __getattr__(name):
+    if name in _LAZY:
+        module = importlib.import_module(f'.{_LAZY[name]}', __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 # Let pytest-asyncio handle the event loop
 # This avoids the "no current event loop" warning
@@ -0,0 +1,161 @@
+"""
+Persistent cache for GPT and market analysis results.
+
+Results live in one SQLite database per cache directory instead of one JSON
+file per key, fronted by a small in-process LRU so repeated lookups never
+touch the disk. Values are encoded with orjson when it is installed.
+"""
+import json
+import time
+import asyncio
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # Optional accelerator, the stdlib json module is used instead
+    orjson = None
+
+# Entries kept in memory per cache; the least recently used are dropped past this size
+MEMORY_MAX_ENTRIES = 1024
+
+def make_key(prefix: str, *parts: str) -> str:
+    """
+    Cache key for the given strings. Unlike the builtin hash() it is stable across
+    processes, and each part is length-prefixed so ("ab", "c") and ("a", "bc") differ.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        data = part.encode('utf-8', 'surrogatepass')
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return f"{prefix}_{digest.hexdigest()}"
+
+def encode_json(value: Any) -> bytes:
+    """Serialize a value to JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode()
+
+def decode_json(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class DiskCache:
+    """
+    Key-value cache of JSON results that expire ttl seconds after they were stored.
+    The in-memory layer keeps encoded values, so every hit returns a fresh dict
+    callers are free to modify. The async methods serve memory hits directly and
+    do their SQLite reads and writes in a worker thread, off the event loop.
+    Expired rows are deleted whenever a cache is opened.
+    """
+
+    def __init__(self, path: Path, ttl: float):
+        self.ttl = ttl
+        self._mem: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+        # Serializes use of the connection between the event loop and worker threads
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, ts REAL, value BLOB)")
+        self._purge_expired()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """The cached value for key, None when missing or expired"""
+        entry = self._mem.get(key)
+        if entry is None:
+            entry = self._fetch([key])[key]
+            if entry is None:
+                return None
+            self._remember(key, entry)
+        else:
+            self._mem.move_to_end(key)
+        return self._decode(entry)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[Dict]]:
+        """get for each key; the entries not in memory are read in one worker thread call"""
+        missing = [key for key in keys if key not in self._mem]
+        fetched = await asyncio.to_thread(self._fetch, missing) if missing else {}
+        results = []
+        for key in keys:
+            # Entries set while the read was in flight are newer than the stored ones
+            entry = self._mem.get(key) or fetched.get(key)
+            if entry is None:
+                results.append(None)
+                continue
+            self._remember(key, entry)
+            results.append(self._decode(entry))
+        return results
+
+    def set(self, key: str, value: Dict):
+        """Store value under key"""
+        entry = (time.time(), encode_json(value))
+        self._remember(key, entry)
+        self._store({key: entry})
+
+    async def set_many(self, values: Dict[str, Dict]):
+        """set for each key and value, writing them to SQLite in one worker thread call"""
+        now = time.time()
+        entries = {key: (now, encode_json(value)) for key, value in values.items()}
+        for key, entry in entries.items():
+            self._remember(key, entry)
+        if entries:
+            await asyncio.to_thread(self._store, entries)
+
+    def close(self):
+        """Close the SQLite connection; later reads miss and later writes are dropped"""
+        with self._lock:
+            self._db.close()
+
+    def _purge_expired(self):
+        """Delete the stored entries that have expired, so the database does not keep growing"""
+        with self._lock:
+            try:
+                self._db.execute("DELETE FROM cache WHERE ts <= ?", (time.time() - self.ttl,))
+            except sqlite3.Error as e:
+                logging.warning(f"Failed to purge expired cache entries: {e}")
+
+    def _fetch(self, keys: List[str]) -> Dict[str, Optional[Tuple[float, bytes]]]:
+        """Read the stored entries for keys from SQLite, None for the missing ones"""
+        entries: Dict[str, Optional[Tuple[float, bytes]]] = dict.fromkeys(keys)
+        with self._lock:
+            for key in keys:
+                try:
+                    entries[key] = self._db.execute("SELECT ts, value FROM cache WHERE key = ?", (key,)).fetchone()
+                except sqlite3.Error as e:
+                    logging.warning(f"Failed to read cache entry {key}: {e}")
+        return entries
+
+    def _store(self, entries: Dict[str, Tuple[float, bytes]]):
+        """Write entries to SQLite"""
+        with self._lock:
+            try:
+                self._db.executemany("INSERT OR REPLACE INTO cache (key, ts, value) VALUES (?, ?, ?)",
+                                     [(key, *entry) for key, entry in entries.items()])
+            except sqlite3.Error as e:
+                logging.warning(f"Failed to write cache entries {', '.join(entries)}: {e}")
+
+    def _decode(self, entry: Tuple[float, bytes]) -> Optional[Dict]:
+        """The value of an entry, None when it expired or is invalid"""
+        stored_at, data = entry
+        if time.time() - stored_at >= self.ttl:
+            return None
+        try:
+            return decode_json(data)
+        except ValueError:
+            # Invalid entry, will recompute
+            return None
+
+    def _remember(self, key: str, entry: Tuple[float, bytes]):
+        """Keep an entry in memory as the most recently used"""
+        self._mem[key] = entry
+        self._mem.move_to_end(key)
+        if len(self._mem) > MEMORY_MAX_ENTRIES:
+            self._mem.popitem(last=False)
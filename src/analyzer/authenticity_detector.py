@@ -1,11 +1,73 @@
 import os
 import re
-from typing import Dict, List, Set
+import math
+import mmap
+import shelve
+import asyncio
+import hashlib
+import logging
+import threading
+from typing import Any, ClassVar, Dict, List, Optional, Set, Tuple, Union
+from ._scanners import SKIP_DIRS, iter_source_files
+from ._workers import process_pool
+
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator, scans fall back to re
+    hyperscan = None  # type: ignore[assignment]
+
+# Files larger than this are almost always generated bundles, not hand-written code
+MAX_FILE_BYTES = 5 * 1024 * 1024
+
+# Files above this size are memory-mapped; below it a plain read is cheaper
+MMAP_MIN_BYTES = 64 * 1024
+
+# Match counts at which the basic (0.3) and advanced (0.5) score caps saturate
+BASIC_MATCH_CAP = 3
+ADVANCED_MATCH_CAP = 5
+
+# Below this many files the process pool start-up costs more than it saves
+PARALLEL_MIN_FILES = 100
+
+# Python, Rust, and TypeScript/JavaScript sources
+_SRC_EXTS = frozenset({'.py', '.rs', '.ts', '.tsx', '.js', '.jsx'})
+
+_PATTERN_FLAGS = re.MULTILINE | re.IGNORECASE
+_PATTERN_CATEGORIES = ('imports', 'basic_patterns', 'advanced_patterns')
+
+# {framework: (weighted score, detected)} for a single file
+ScanResult = Dict[str, Tuple[float, bool]]
+
+def _compile_frameworks(frameworks: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, List[re.Pattern]]]:
+    """Compile every framework pattern once so scans reuse the pattern objects"""
+    # Patterns are deliberately kept separate rather than fused into one
+    # alternation per category: CPython's backtracking engine loses its
+    # literal-prefix fast search on alternations, which made a fused
+    # finditer pass 2-3x slower than the individual searches it replaced.
+    return {
+        framework: {
+            category: [re.compile(pattern.encode(), _PATTERN_FLAGS) for pattern in patterns[category]]
+            for category in _PATTERN_CATEGORIES
+        }
+        for framework, patterns in frameworks.items()
+    }
+
+def _list_scannable_files(root: str) -> List[os.DirEntry]:
+    """List source files worth scanning, skipping empty and oversized ones before opening"""
+    entries = []
+    for entry in iter_source_files(root, _SRC_EXTS):
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            continue
+        if 0 < size <= MAX_FILE_BYTES:
+            entries.append(entry)
+    return entries
 
 class AuthenticityDetector:
     """Detects and scores AI implementation authenticity"""
     
-    KNOWN_AI_FRAMEWORKS = {
+    KNOWN_AI_FRAMEWORKS: ClassVar[Dict[str, Dict[str, Any]]] = {
         'tensorflow': {
             'imports': {r'import\s+tensorflow', r'import\s+tf', r'from\s+tensorflow'},
             'basic_patterns': {
@@ -96,7 +158,7 @@ class AuthenticityDetector:
             'weight': 0.7  # Framework with some abstraction
         },
         'rig': {
-            'imports': {'use rig', 'from rig'},
+            'imports': {re.escape('use rig'), re.escape('from rig')},
             'basic_patterns': {
                 r'CompletionModel', r'EmbeddingModel', r'Agent',
                 r'VectorStore'
@@ -124,8 +186,8 @@ class AuthenticityDetector:
         0.5: Basic API usage
         0.0: No AI implementation
         """
-        self.framework_scores = {}
-        detected = self._find_framework_implementations()
+        self.framework_scores: Dict[str, float] = {}
+        detected = await self._find_framework_implementations()
         if not detected:
             return 0.0
             
@@ -144,56 +206,93 @@ class AuthenticityDetector:
         
         return min(1.0, final_score)
         
-    def _find_framework_implementations(self) -> Set[str]:
+    async def _find_framework_implementations(self) -> Set[str]:
         """Find AI framework implementations in the codebase"""
-        detected_frameworks = set()
-        framework_scores = {}
-        
-        for root, _, files in os.walk(self.repo_path):
-            for file in files:
-                if not file.endswith(('.py', '.rs', '.ts', '.tsx', '.js', '.jsx')):  # Support Python, Rust, and TypeScript/JavaScript
-                    continue
-                    
-                with open(os.path.join(root, file), 'r') as f:
-                    content = f.read()
-                    
-                for framework, patterns in self.KNOWN_AI_FRAMEWORKS.items():
-                    score = 0
-                    # Check imports (20% of framework score)
-                    if any(re.search(pattern, content, re.MULTILINE | re.IGNORECASE) for pattern in patterns['imports']):
-                        score += 0.2
-                        
-                    # Check basic implementation patterns (30% of framework score)
-                    basic_matches = sum(1 for pattern in patterns['basic_patterns']
-                                     if re.search(pattern, content, re.MULTILINE | re.IGNORECASE))
-                    if basic_matches > 0:
-                        score += min(0.3, basic_matches * 0.1)  # Cap at 0.3
-                        
-                    # Check advanced implementation patterns (50% of framework score)
-                    advanced_matches = sum(1 for pattern in patterns['advanced_patterns']
-                                       if re.search(pattern, content, re.MULTILINE | re.IGNORECASE))
-                    if advanced_matches > 0:
-                        score += min(0.5, advanced_matches * 0.1)  # Cap at 0.5
-                        
-                    # Apply framework weight
-                    score *= patterns['weight']
-                    
-                    # Update framework score if higher than existing
-                    if score > 0:
-                        framework_scores[framework] = max(
-                            score,
-                            framework_scores.get(framework, 0)
-                        )
-                        # More lenient detection for test files and imports
-                        if any(re.search(pattern, content, re.MULTILINE | re.IGNORECASE) for pattern in patterns['imports']):
-                            detected_frameworks.add(framework)  # Add framework if imports are found
-                        elif score > 0.2:  # Add if significant implementation found
-                            detected_frameworks.add(framework)
+        detected_frameworks: Set[str] = set()
+        framework_scores: Dict[str, float] = {}
+        
+        # Walking and stat-ing the tree blocks, keep it off the event loop
+        entries = await asyncio.to_thread(_list_scannable_files, self.repo_path)
+        for file_result in await self._scan_files_cached(entries):
+            for framework, (score, detected) in file_result.items():
+                # Update framework score if higher than existing
+                framework_scores[framework] = max(
+                    score,
+                    framework_scores.get(framework, 0)
+                )
+                if detected:
+                    detected_frameworks.add(framework)
         
         # Update instance variable for use in scoring
         self.framework_scores = framework_scores
         return detected_frameworks
         
+    async def _scan_files_cached(self, entries: List[os.DirEntry]) -> List[ScanResult]:
+        """
+        Scan files, reusing results for files unchanged since the last run.
+        Results persist next to the GPT analysis cache in one record per
+        repository root, holding the files seen by its latest scan; each file's
+        result is invalidated when its mtime or size changes.
+        """
+        paths = [entry.path for entry in entries]
+        cache_path = os.getenv('GPT_ANALYSIS_CACHE_PATH')
+        if not cache_path:
+            return await self._scan_files(paths)
+            
+        root = os.path.abspath(self.repo_path)
+        rel_paths = [os.path.relpath(path, root) for path in paths]
+        signatures = {}
+        for rel_path, entry in zip(rel_paths, entries):
+            try:
+                # DirEntry caches the stat taken while filtering entries
+                stat = entry.stat()
+            except OSError:
+                continue
+            signatures[rel_path] = (stat.st_mtime_ns, stat.st_size, _PATTERNS_DIGEST)
+            
+        cache_file = os.path.join(cache_path, 'authenticity_scan')
+        try:
+            hits, stored = await asyncio.to_thread(_read_scan_cache, cache_file, root, signatures)
+        except Exception as e:
+            logging.warning(f"Authenticity scan cache unavailable: {e}")
+            return await self._scan_files(paths)
+            
+        results = [hits.get(rel_path, {}) for rel_path in rel_paths]
+        misses = [index for index, rel_path in enumerate(rel_paths)
+                  if rel_path in signatures and rel_path not in hits]
+        scanned = await self._scan_files([paths[index] for index in misses])
+        for index, result in zip(misses, scanned):
+            results[index] = result
+            
+        # The stored record is rewritten only when it differs from this scan
+        if misses or stored != len(hits):
+            record = {
+                rel_path: (signatures[rel_path], result)
+                for rel_path, result in zip(rel_paths, results) if rel_path in signatures
+            }
+            try:
+                await asyncio.to_thread(_write_scan_cache, cache_file, root, record)
+            except Exception as e:
+                logging.warning(f"Failed to save authenticity scan cache: {e}")
+        return results
+        
+    async def _scan_files(self, paths: List[str]) -> List[ScanResult]:
+        """Scan files, spreading large repositories across worker processes"""
+        if len(paths) < PARALLEL_MIN_FILES:
+            # Keep the file reads and regex work off the event loop
+            return await asyncio.to_thread(_scan_chunk, paths)
+            
+        workers = os.cpu_count() or 1
+        chunksize = max(1, math.ceil(len(paths) / (workers * 4)))
+        chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+        
+        loop = asyncio.get_running_loop()
+        pool = process_pool()
+        chunk_results = await asyncio.gather(
+            *(loop.run_in_executor(pool, _scan_chunk, chunk) for chunk in chunks)
+        )
+        return [result for chunk in chunk_results for result in chunk]
+        
     def _analyze_implementation(self, frameworks: Set[str]) -> float:
         """
         Analyze implementation depth of AI frameworks
@@ -221,9 +320,185 @@ class AuthenticityDetector:
             base_score *= 1.2  # 20% bonus for 2 frameworks
             
         return min(1.0, base_score)
+
+def _build_hyperscan_database(frameworks: Dict[str, Dict[str, Any]]) -> Optional[Tuple[Any, List[Tuple[str, str]]]]:
+    """
+    Compile every framework pattern into a single Hyperscan database so each
+    file is scanned once for all patterns. Returns (database, pattern owners)
+    where owners maps pattern id to (framework, category), or None when
+    Hyperscan is unavailable or rejects a pattern.
+    """
+    if hyperscan is None:
+        return None
         
-        # Bonus for multiple framework integration
-        if len(frameworks) > 1:
-            base_score *= (1.0 + 0.1 * (len(frameworks) - 1))  # 10% bonus per additional framework
+    expressions = []
+    owners = []
+    for framework, patterns in frameworks.items():
+        for category in _PATTERN_CATEGORIES:
+            for pattern in patterns[category]:
+                expressions.append(pattern.encode())
+                owners.append((framework, category))
+                
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_SINGLEMATCH
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=[flags] * len(expressions)
+        )
+    except Exception:
+        return None
+    return database, owners
+
+_COMPILED = _compile_frameworks(AuthenticityDetector.KNOWN_AI_FRAMEWORKS)
+_HYPERSCAN = _build_hyperscan_database(AuthenticityDetector.KNOWN_AI_FRAMEWORKS)
+
+def _patterns_digest(frameworks: Dict[str, Dict[str, Any]]) -> str:
+    """Stable digest of the framework patterns, so cached scans expire when they change"""
+    canonical = sorted(
+        (framework, patterns['weight'], [sorted(patterns[category]) for category in _PATTERN_CATEGORIES])
+        for framework, patterns in frameworks.items()
+    )
+    return hashlib.blake2b(repr(canonical).encode(), digest_size=16).hexdigest()
+
+_PATTERNS_DIGEST = _patterns_digest(AuthenticityDetector.KNOWN_AI_FRAMEWORKS)
+
+# Serializes use of the scan cache shelf between detectors running in worker threads
+_scan_cache_lock = threading.Lock()
+
+def _read_scan_cache(cache_file: str, root: str,
+                     signatures: Dict[str, Tuple[int, int, str]]) -> Tuple[Dict[str, ScanResult], int]:
+    """
+    Cached results for root's files whose signature is unchanged, by repo-relative
+    path, and the number of files in root's stored record
+    """
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    with _scan_cache_lock, shelve.open(cache_file) as cache:
+        record = cache.get(root)
+    if not isinstance(record, dict):
+        return {}, 0
+    hits = {
+        rel_path: result for rel_path, (signature, result) in record.items()
+        if signatures.get(rel_path) == signature
+    }
+    return hits, len(record)
+
+def _write_scan_cache(cache_file: str, root: str, record: Dict[str, Tuple[Tuple[int, int, str], ScanResult]]):
+    """Store root's scan record, dropping the records of repositories that no longer exist"""
+    with _scan_cache_lock, shelve.open(cache_file) as cache:
+        cache[root] = record
+        for key in list(cache.keys()):
+            if not os.path.isdir(key):
+                del cache[key]
+
+def _count_matches(content: Union[bytes, mmap.mmap]) -> Dict[str, Dict[str, int]]:
+    """
+    Count distinct matching patterns per framework and pattern category.
+    Imports only record presence (0 or 1) since any single import is enough,
+    and the re backend stops counting once a category's score cap is reached.
+    """
+    counts = {
+        framework: dict.fromkeys(_PATTERN_CATEGORIES, 0)
+        for framework in AuthenticityDetector.KNOWN_AI_FRAMEWORKS
+    }
+    
+    if _HYPERSCAN is not None:
+        database, owners = _HYPERSCAN
+        
+        def on_match(pattern_id, start, end, flags, context):
+            framework, category = owners[pattern_id]
+            if category == 'imports':
+                counts[framework][category] = 1
+            else:
+                counts[framework][category] += 1
             
-        return min(1.0, base_score)  # Cap at 1.0
+        database.scan(content, match_event_handler=on_match)
+        return counts
+        
+    for framework, compiled in _COMPILED.items():
+        framework_counts = counts[framework]
+        framework_counts['imports'] = int(any(pattern.search(content) for pattern in compiled['imports']))
+        framework_counts['basic_patterns'] = _count_up_to(
+            compiled['basic_patterns'], content, BASIC_MATCH_CAP)
+        framework_counts['advanced_patterns'] = _count_up_to(
+            compiled['advanced_patterns'], content, ADVANCED_MATCH_CAP)
+    return counts
+
+def _count_up_to(patterns: List[re.Pattern], content: Union[bytes, mmap.mmap], limit: int) -> int:
+    """Count matching patterns, stopping once limit is reached since the score is capped there"""
+    matches = 0
+    for pattern in patterns:
+        if pattern.search(content):
+            matches += 1
+            if matches >= limit:
+                break
+    return matches
+
+def _scan_file(path: str, seen: Optional[Dict[bytes, ScanResult]] = None) -> ScanResult:
+    """
+    Score a single file against every known framework.
+    Returns {framework: (weighted score, detected)} for frameworks with a non-zero score.
+    When seen is given, byte-identical files are scored once per content digest.
+    """
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or size > MAX_FILE_BYTES:
+                return {}
+            if size > MMAP_MIN_BYTES:
+                # Scan the page cache directly instead of copying large files into a bytes object
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    return _scan_content(content, seen)
+            return _scan_content(f.read(), seen)
+    except (OSError, ValueError):
+        return {}
+
+def _scan_content(content: Union[bytes, mmap.mmap], seen: Optional[Dict[bytes, ScanResult]]) -> ScanResult:
+    """Score file content, reusing the result of an earlier file with the same bytes"""
+    if seen is None:
+        return _score_counts(_count_matches(content))
+        
+    # Hashing is far cheaper than running every pattern over vendored or generated copies
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    results = seen.get(digest)
+    if results is None:
+        results = seen[digest] = _score_counts(_count_matches(content))
+    return results
+
+def _score_counts(counts: Dict[str, Dict[str, int]]) -> ScanResult:
+    """Turn per-category match counts into weighted framework scores"""
+    results: ScanResult = {}
+    for framework, patterns in AuthenticityDetector.KNOWN_AI_FRAMEWORKS.items():
+        matches = counts[framework]
+        score: float = 0.0
+        # Check imports (20% of framework score)
+        has_import = matches['imports'] > 0
+        if has_import:
+            score += 0.2
+            
+        # Check basic implementation patterns (30% of framework score)
+        basic_matches: int = matches['basic_patterns']
+        if basic_matches > 0:
+            score += min(0.3, basic_matches * 0.1)  # Cap at 0.3
+            
+        # Check advanced implementation patterns (50% of framework score)
+        advanced_matches: int = matches['advanced_patterns']
+        if advanced_matches > 0:
+            score += min(0.5, advanced_matches * 0.1)  # Cap at 0.5
+            
+        # Apply framework weight
+        score *= patterns['weight']
+        
+        if score > 0:
+            # More lenient detection for test files and imports:
+            # add framework if imports are found or significant implementation found
+            results[framework] = (score, has_import or score > 0.2)
+            
+    return results
+
+def _scan_chunk(paths: List[str]) -> List[ScanResult]:
+    """Scan a batch of files, scoring each distinct file content only once"""
+    seen: Dict[bytes, ScanResult] = {}
+    return [_scan_file(path, seen) for path in paths]
@@ -1,24 +1,90 @@
 import os
-import re
 import ast
-from typing import List, Dict
+import math
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Callable, List, Dict, Optional, Tuple, TypeVar
+from ._scanners import PatternSet, iter_source_files
+from ._workers import process_pool
+
+T = TypeVar('T')
+
+# Below this many files the process pool start-up costs more than it saves
+PARALLEL_MIN_FILES = 100
+
+# Sources the syntax (.py) and implementation (.py, .rs) checks read
+SOURCE_EXTENSIONS = frozenset({'.py', '.rs'})
+
+# Larger Python files are almost always generated; the syntax check skips them
+SYNTAX_MAX_BYTES = 512 * 1024
+
+# Syntax check results remembered per process by content digest, oldest dropped first
+SYNTAX_CACHE_MAX_ENTRIES = 4096
+_syntax_cache: "OrderedDict[bytes, bool]" = OrderedDict()
+
+# Each check's patterns are compiled once at import. Without Hyperscan they stay
+# separate re searches rather than one alternation: measured on an 800-line file
+# without matches, a fused pattern per check was 2x slower and a single named-group
+# pass over all four checks 4x slower, as alternations lose re's literal-prefix scan.
+
+# AI model initialization
+MODEL_INIT_PATTERNS = PatternSet([
+    rb'CompletionModel::new',
+    rb'EmbeddingModel::new',
+    rb'Agent::new',
+    rb'model\s*=\s*[A-Za-z]+Model\(',
+    rb'torch\.nn\.Module',
+    rb'keras\.Model',
+])
+
+# Inference/prediction methods
+INFERENCE_PATTERNS = PatternSet([
+    rb'async\s+fn\s+completion',
+    rb'async\s+fn\s+embed',
+    rb'fn\s+forward',
+    rb'def\s+predict',
+    rb'def\s+forward',
+    rb'model\.predict',
+])
+
+# AI-specific error handling
+AI_ERROR_HANDLING_PATTERNS = PatternSet([
+    rb'CompletionError',
+    rb'EmbeddingError',
+    rb'Result<.*Response',
+    rb'try:.*except\s+(torch|tensorflow|transformers)',
+])
+
+# Model configuration
+MODEL_CONFIG_PATTERNS = PatternSet([
+    rb'temperature\s*=',
+    rb'max_tokens\s*=',
+    rb'model_name\s*=',
+    rb'batch_size\s*=',
+    rb'learning_rate\s*=',
+])
 
 class ExecutionVerifier:
     """Verifies if the code can actually execute and perform AI operations"""
     
     def __init__(self, repo_path: str):
         self.repo_path = repo_path
+        self._sources: Optional[List[str]] = None
         
     async def verify_execution(self) -> float:
         """
         Verify if the code can execute and perform AI operations
         Returns a score between 0 and 1
         """
+        # List the tree afresh for each verification, shared by the checks below
+        self._sources = None
+        
         # Check for basic executability
-        syntax_score = self._check_syntax()
+        syntax_score = await self._check_syntax()
         
         # Check for proper AI function implementation
-        implementation_score = self._check_implementation()
+        implementation_score = await self._check_implementation()
         
         # Check for proper dependency management
         dependency_score = self._check_dependencies()
@@ -27,107 +93,123 @@ class ExecutionVerifier:
         # Implementation is most important, followed by syntax, then dependencies
         return (syntax_score * 0.25 + implementation_score * 0.65 + dependency_score * 0.1)
         
-    def _check_syntax(self) -> float:
+    async def _check_syntax(self) -> float:
         """Check if the code has valid syntax"""
-        valid_files = 0
-        total_files = 0
-        
-        for root, _, files in os.walk(self.repo_path):
-            for file in files:
-                if not file.endswith('.py'):
-                    continue
-                    
-                total_files += 1
-                try:
-                    with open(os.path.join(root, file), 'r') as f:
-                        ast.parse(f.read())
-                    valid_files += 1
-                except SyntaxError:
-                    continue
-                    
-        return valid_files / max(total_files, 1)
-        
-    def _check_implementation(self) -> float: 
+        paths = await self._source_paths(('.py',))
+        checked = [valid for valid in await _map_files(_parse_one, paths) if valid is not None]
+        return sum(checked) / max(len(checked), 1)
+        
+    async def _check_implementation(self) -> float: 
         """Check if AI-related functions are properly implemented"""
-        implementation_score = 0.0
-        total_checks = 0
-        
-        for root, _, files in os.walk(self.repo_path):
-            for file in files:
-                if not file.endswith(('.py', '.rs')):
-                    continue
-                    
-                with open(os.path.join(root, file), 'r') as f:
-                    content = f.read()
-                
-                # Check for AI model initialization
-                if self._check_model_init(content):
-                    implementation_score += 1
-                    total_checks += 1
-                
-                # Check for inference/prediction methods
-                if self._check_inference_methods(content):
-                    implementation_score += 1
-                    total_checks += 1
-                
-                # Check for proper error handling in AI operations
-                if self._check_ai_error_handling(content):
-                    implementation_score += 1
-                    total_checks += 1
-                    
-                # Check for model configuration
-                if self._check_model_config(content):
-                    implementation_score += 1
-                    total_checks += 1
+        paths = await self._source_paths(('.py', '.rs'))
+        # Every passing check adds to both the score and the check count
+        implementation_score = sum(await _map_files(_count_implementation_checks, paths))
+        total_checks = implementation_score
         
         return implementation_score / max(total_checks, 1)
         
-    def _check_model_init(self, content: str) -> bool:
+    async def _source_paths(self, extensions: Tuple[str, ...]) -> List[str]:
+        """
+        List files under the repository with one of the given extensions, pruning SKIP_DIRS.
+        The tree is walked once, in a worker thread, and the listing shared by the checks.
+        """
+        if self._sources is None:
+            self._sources = await asyncio.to_thread(_list_sources, self.repo_path)
+        return [path for path in self._sources if path.endswith(extensions)]
+        
+    @staticmethod
+    def _check_model_init(content: bytes) -> bool:
         """Check for proper model initialization"""
-        patterns = [
-            r'CompletionModel::new',
-            r'EmbeddingModel::new',
-            r'Agent::new',
-            r'model\s*=\s*[A-Za-z]+Model\(',
-            r'torch\.nn\.Module',
-            r'keras\.Model',
-        ]
-        return any(re.search(pattern, content) for pattern in patterns)
-        
-    def _check_inference_methods(self, content: str) -> bool:
+        return MODEL_INIT_PATTERNS.search(content)
+        
+    @staticmethod
+    def _check_inference_methods(content: bytes) -> bool:
         """Check for inference/prediction methods"""
-        patterns = [
-            r'async\s+fn\s+completion',
-            r'async\s+fn\s+embed',
-            r'fn\s+forward',
-            r'def\s+predict',
-            r'def\s+forward',
-            r'model\.predict',
-        ]
-        return any(re.search(pattern, content) for pattern in patterns)
-        
-    def _check_ai_error_handling(self, content: str) -> bool:
+        return INFERENCE_PATTERNS.search(content)
+        
+    @staticmethod
+    def _check_ai_error_handling(content: bytes) -> bool:
         """Check for AI-specific error handling"""
-        patterns = [
-            r'CompletionError',
-            r'EmbeddingError',
-            r'Result<.*Response',
-            r'try:.*except\s+(torch|tensorflow|transformers)',
-        ]
-        return any(re.search(pattern, content) for pattern in patterns)
-        
-    def _check_model_config(self, content: str) -> bool:
+        return AI_ERROR_HANDLING_PATTERNS.search(content)
+        
+    @staticmethod
+    def _check_model_config(content: bytes) -> bool:
         """Check for model configuration"""
-        patterns = [
-            r'temperature\s*=',
-            r'max_tokens\s*=',
-            r'model_name\s*=',
-            r'batch_size\s*=',
-            r'learning_rate\s*=',
-        ]
-        return any(re.search(pattern, content) for pattern in patterns)
+        return MODEL_CONFIG_PATTERNS.search(content)
         
     def _check_dependencies(self) -> float:
         """Check if all required dependencies are properly specified"""
         # TODO: Implement dependency verification
         return 0.5
+
+def _list_sources(repo_path: str) -> List[str]:
+    """Paths of every source file any check reads"""
+    return [entry.path for entry in iter_source_files(repo_path, SOURCE_EXTENSIONS)]
+
+def _parse_one(path: str) -> Optional[bool]:
+    """
+    Whether a Python file parses, None for empty and oversized files which the
+    check skips; module level so worker processes can run it
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or size > SYNTAX_MAX_BYTES:
+            return None
+        return _parses(f.read())
+
+def _parses(content: bytes) -> bool:
+    """Whether Python source parses; identical sources are only parsed once"""
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    valid = _syntax_cache.get(digest)
+    if valid is None:
+        # Parse the raw bytes: the parser honours coding declarations and BOMs itself
+        # and undecodable files surface as a SyntaxError instead of a crash
+        try:
+            ast.parse(content)
+            valid = True
+        except (SyntaxError, ValueError):  # ValueError for null bytes before Python 3.12
+            valid = False
+        _syntax_cache[digest] = valid
+        if len(_syntax_cache) > SYNTAX_CACHE_MAX_ENTRIES:
+            _syntax_cache.popitem(last=False)
+    return valid
+
+def _count_implementation_checks(path: str) -> int:
+    """Count the AI implementation checks a file passes"""
+    with open(path, 'rb') as f:
+        content = f.read()
+        
+    return sum((
+        # Check for AI model initialization
+        ExecutionVerifier._check_model_init(content),
+        # Check for inference/prediction methods
+        ExecutionVerifier._check_inference_methods(content),
+        # Check for proper error handling in AI operations
+        ExecutionVerifier._check_ai_error_handling(content),
+        # Check for model configuration
+        ExecutionVerifier._check_model_config(content),
+    ))
+
+def _apply(func: Callable[[str], T], paths: List[str]) -> List[T]:
+    """Apply func to a batch of paths inside a worker"""
+    return [func(path) for path in paths]
+
+async def _map_files(func: Callable[[str], T], paths: List[str]) -> List[T]:
+    """
+    Apply func to every path off the event loop. Small batches run in a worker
+    thread; large ones are spread across processes since parsing and regex
+    matching are CPU-bound and hold the GIL.
+    """
+    if len(paths) < PARALLEL_MIN_FILES:
+        return await asyncio.to_thread(_apply, func, paths)
+        
+    workers = os.cpu_count() or 1
+    chunksize = max(1, math.ceil(len(paths) / (workers * 4)))
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+    
+    loop = asyncio.get_running_loop()
+    pool = process_pool()
+    chunk_results = await asyncio.gather(
+        *(loop.run_in_executor(pool, _apply, func, chunk) for chunk in chunks)
+    )
+    return [result for chunk in chunk_results for result in chunk]
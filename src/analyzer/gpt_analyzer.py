@@ -1,44 +1,223 @@
 import os
 import json
+import math
 import time
 import asyncio
 import logging
-from typing import Dict, List, Optional
+import functools
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
-from unittest.mock import MagicMock, AsyncMock
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DEFAULT_CONNECTION_LIMITS
+from ._cache import DiskCache, decode_json, encode_json, make_key
 
-# Global test mock
-_test_mock = None
+# Connection pool shared by every request of a GPTAnalyzer's client, built with the
+# Limits class of the httpx release the installed openai package uses
+HTTP_LIMITS = type(DEFAULT_CONNECTION_LIMITS)(max_connections=64, max_keepalive_connections=32)
 
-def set_test_mock(mock):
-    """Set the global test mock for GPTAnalyzer"""
-    global _test_mock
-    _test_mock = mock
+# Batch API status polling backs off exponentially between these delays (seconds)
+BATCH_POLL_BASE_DELAY = 5.0
+BATCH_POLL_MAX_DELAY = 60.0
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Batch job states after which polling stops
+BATCH_FINAL_STATES = frozenset({'completed', 'failed', 'expired', 'cancelled'})
+
+# System prompt for code segment analysis
+CODE_ANALYSIS_PROMPT = """You are an expert code analyzer focused on:
+1. Identifying AI/ML implementations
+2. Detecting code quality issues
+3. Finding potential plagiarism
+4. Assessing code executability
+
+Provide analysis in JSON format with these keys:
+- ai_score: float 0-1
+- quality_score: float 0-1
+- originality_score: float 0-1
+- execution_score: float 0-1
+- market_value: float 0-1
+- findings: list of strings
+- recommendations: list of strings"""
+
+# System prompt for several code segments sent in one request
+CODE_SEGMENTS_PROMPT = CODE_ANALYSIS_PROMPT + """
+
+The user message is a JSON array of code segments, each with an id, its code and its context.
+Analyze every segment separately and reply with one JSON object {"results": [...]} holding
+one analysis per segment with the keys above plus the segment's id."""
+
+# System prompt for AI implementation verification
+AI_VERIFICATION_PROMPT = """You are an expert at identifying genuine AI/ML implementations.
+Focus on distinguishing between:
+1. Real ML model implementations
+2. Basic API calls to AI services
+3. Framework-level AI code
+4. Simple prompt engineering
+
+Provide analysis in JSON format with:
+- is_real_ai: boolean
+- implementation_type: string (framework|api|hybrid|none)
+- confidence: float 0-1
+- evidence: list of strings
+- suggestions: list of strings"""
+
+# System prompt for code originality checks
+ORIGINALITY_PROMPT = """You are an expert at identifying code originality and potential plagiarism.
+Focus on:
+1. Common code patterns vs unique implementations
+2. Framework-specific boilerplate
+3. Copied documentation or comments
+4. Unique algorithmic approaches
+
+Provide analysis in JSON format with:
+- originality_score: float 0-1
+- is_likely_copied: boolean
+- common_patterns: list of strings
+- unique_elements: list of strings
+- recommendations: list of strings"""
+
+# System prompt for market context analysis
+MARKET_ANALYSIS_PROMPT = """You are an expert at analyzing AI project market success.
+Focus on:
+1. Project popularity (GitHub stars, forks)
+2. Community adoption and engagement
+3. Industry recognition and impact
+4. Market presence and growth
+
+Provide analysis in JSON format with:
+- popularity_score: float 0-1
+- adoption_score: float 0-1
+- impact_score: float 0-1
+- popularity_metrics: object
+- community_metrics: object
+- market_context: string
+- recommendations: list of strings"""
+
+# System prompt asking for all three code analyses in one reply
+FULL_ANALYSIS_PROMPT = """You are an expert code analyzer. For the code you are given:
+1. Identify AI/ML implementations, code quality issues and executability
+2. Distinguish real ML model implementations from basic AI API calls, framework-level AI code and simple prompt engineering
+3. Assess originality: common patterns and boilerplate versus unique implementations
+
+Provide one JSON object with three keys:
+- analysis: object with ai_score, quality_score, originality_score, execution_score and
+  market_value (floats 0-1), findings and recommendations (lists of strings)
+- verification: object with is_real_ai (boolean), implementation_type (string:
+  framework|api|hybrid|none), confidence (float 0-1), evidence and suggestions (lists of strings)
+- originality: object with originality_score (float 0-1), is_likely_copied (boolean),
+  common_patterns, unique_elements and recommendations (lists of strings)"""
+
+# Replies are constrained to a single JSON object
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# System messages, built once and shared by every request
+_CODE_ANALYSIS_SYSTEM = {"role": "system", "content": CODE_ANALYSIS_PROMPT}
+_CODE_SEGMENTS_SYSTEM = {"role": "system", "content": CODE_SEGMENTS_PROMPT}
+_AI_VERIFICATION_SYSTEM = {"role": "system", "content": AI_VERIFICATION_PROMPT}
+_ORIGINALITY_SYSTEM = {"role": "system", "content": ORIGINALITY_PROMPT}
+_MARKET_ANALYSIS_SYSTEM = {"role": "system", "content": MARKET_ANALYSIS_PROMPT}
+_FULL_ANALYSIS_SYSTEM = {"role": "system", "content": FULL_ANALYSIS_PROMPT}
+
+# Results returned when GPT fails, built once. Each fallback is a shallow copy with
+# the failure message filled in; the other values are shared and must not be mutated
+_FALLBACK_ANALYSIS = {
+    'ai_score': 0.5,
+    'quality_score': 0.5,
+    'originality_score': 0.5,
+    'execution_score': 0.5,
+    'market_value': 0.5,
+    'findings': ["No findings available"],
+    'recommendations': ["Enable GPT analysis for enhanced results"]
+}
+_FALLBACK_VERIFICATION = {
+    'is_real_ai': False,
+    'implementation_type': 'unknown',
+    'confidence': 0.0,
+    'evidence': [],
+    'suggestions': ["Enable GPT analysis for AI verification"]
+}
+_FALLBACK_ORIGINALITY = {
+    'originality_score': 0.5,
+    'is_likely_copied': False,
+    'common_patterns': [],
+    'unique_elements': [],
+    'recommendations': ["Enable GPT analysis for originality verification"]
+}
+_FALLBACK_MARKET_CONTEXT = {
+    'popularity_score': 0.5,
+    'adoption_score': 0.5,
+    'impact_score': 0.5,
+    'popularity_metrics': {},
+    'community_metrics': {},
+    'market_context': "",
+    'recommendations': ["Enable GPT analysis for market research"]
+}
+
+def singleflight(key_for: Callable[..., str]):
+    """
+    Decorate a GPTAnalyzer method so concurrent calls with the same cache key, as
+    computed by key_for from the call's arguments, make one request and share it
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            return await self._singleflight(key_for(*args, **kwargs), lambda: method(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
+@dataclass
+class TokenBucket:
+    """Rate limiter holding up to capacity tokens, refilled continuously at refill_per_sec"""
+    capacity: float
+    refill_per_sec: float
+    tokens: float = -1.0
+    last: float = -1.0
+    
+    def __post_init__(self):
+        # A new bucket starts full
+        if self.tokens < 0:
+            self.tokens = self.capacity
+        if self.last < 0:
+            self.last = time.monotonic()
+            
+    def refill(self):
+        """Add the tokens accrued since the last refill, up to capacity"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.refill_per_sec)
+        self.last = now
+        
+    def wait_time(self) -> float:
+        """Seconds until a token is available, 0 when one is available now"""
+        self.refill()
+        if self.tokens >= 1:
+            return 0.0
+        if self.refill_per_sec <= 0:
+            return math.inf
+        return (1 - self.tokens) / self.refill_per_sec
 
 class GPTAnalyzer:
     """Uses GPT to enhance code analysis capabilities with caching and rate limiting"""
     
-    def __init__(self):
-        # Get API key and set test mode
+    def __init__(self, client: Optional[Any] = None):
+        # Get API key
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OpenAI API key not found in environment")
             
-        # Configure rate limiting first - always use environment value
+        # Configure rate limiting first - always use environment value. A token bucket
+        # allows bursts of max_calls and refills continuously at max_calls per hour
         self.max_calls = int(os.getenv('MAX_GPT_CALLS', '5'))
-        self.calls_made = 0
-        self.call_reset_time = time.time() + 3600  # Reset counter every hour
-        print(f"GPTAnalyzer initialized with max_calls={self.max_calls}")
+        self._bucket = TokenBucket(capacity=self.max_calls, refill_per_sec=self.max_calls / 3600)
+        self._bucket_lock = asyncio.Lock()
+        
+        # Calls wait for a token due within this many seconds, later ones get the fallback
+        self.rate_limit_max_wait = float(os.getenv('GPT_RATE_LIMIT_MAX_WAIT', '30'))
+        
+        # Requests in flight at once; the bucket caps the rate, this caps concurrency
+        self._sem = asyncio.Semaphore(int(os.getenv('MAX_INFLIGHT', '10')))
+        logging.debug(f"GPTAnalyzer initialized with max_calls={self.max_calls}")
         
-        # Set test mode if using test key (after rate limit config)
-        self.is_test = api_key == 'test-key'
+        # Chat model for every request; JSON scoring does not need the largest model
+        self.model = os.getenv('GPT_MODEL', 'gpt-4o-mini')
         
         # Configure caching
         cache_path = os.getenv('GPT_ANALYSIS_CACHE_PATH')
@@ -50,414 +229,491 @@ class GPTAnalyzer:
             
         # Cache TTL in seconds (default 24 hours)
         self.cache_ttl = int(os.getenv('GPT_CACHE_TTL', str(24 * 3600)))
+        self._cache = DiskCache(self.cache_dir / 'cache.db', self.cache_ttl) if self.cache_dir else None
         
-        # Initialize OpenAI client
-        if self.is_test:
-            # Use provided test mock or create default
-            if _test_mock is not None:
-                self.client = _test_mock
-                print(f"Using provided test mock with max_calls={self.max_calls}")
-            else:
-                # Create default mock with async support
-                mock = MagicMock()
-                mock.chat = MagicMock()
-                mock.chat.completions = MagicMock()
-                
-                # Create different responses based on the prompt content
-                async def mock_create(**kwargs):
-                    messages = kwargs.get('messages', [])
-                    user_content = messages[-1]['content'] if messages else ""
-                    
-                    if "market success" in user_content.lower():
-                        # Market analysis response
-                        content = {
-                            'popularity_score': 0.85,
-                            'adoption_score': 0.80,
-                            'impact_score': 0.75,
-                            'popularity_metrics': {
-                                'stars': 1200,
-                                'forks': 150,
-                                'watchers': 300
-                            },
-                            'community_metrics': {
-                                'contributors': 25,
-                                'issues': 150,
-                                'pull_requests': 200
-                            },
-                            'market_context': "Strong community engagement and adoption",
-                            'recommendations': ["Consider enterprise support options"]
-                        }
-                    else:
-                        # Code analysis response
-                        content = {
-                            'ai_score': 0.8,
-                            'quality_score': 0.7,
-                            'originality_score': 0.9,
-                            'execution_score': 0.6,
-                            'market_value': 0.85,
-                            'findings': ["Good AI implementation"],
-                            'recommendations': ["Consider optimizing further"]
-                        }
-                    
-                    return MagicMock(
-                        choices=[MagicMock(message=MagicMock(
-                            content=json.dumps(content)
-                        ))]
-                    )
-                
-                mock.chat.completions.create = AsyncMock(side_effect=mock_create)
-                self.client = mock
-                print("Using default test mock")
+        # Analyses being computed, by cache key; concurrent callers share them
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # Uncached segments sent together in one chat completion (default 8)
+        self.max_batch_segments = max(int(os.getenv('MAX_BATCH_SEGMENTS', '8')), 1)
+        
+        # Batch jobs still running after this many seconds are cancelled (default 1 hour)
+        self.batch_timeout = float(os.getenv('GPT_BATCH_TIMEOUT', '3600'))
+        
+        # Bulk scans go through the Batch API when enabled: half the cost, but results
+        # may take hours. Requests queued for the next batch, by cache key
+        self.use_batch_api = os.getenv('USE_BATCH_API') == '1'
+        self._batch_requests: Dict[str, Dict] = {}
+        
+        # Initialize OpenAI client; tests pass in a stand-in
+        if client is not None:
+            self.client = client
         else:
-            self.client = OpenAI(api_key=api_key)
+            # Native async client: requests are awaited on the event loop, not in threads
+            self.client = AsyncOpenAI(api_key=api_key, http_client=DefaultAsyncHttpxClient(limits=HTTP_LIMITS))
+        
+    def close(self):
+        """Close the analysis cache database"""
+        if self._cache is not None:
+            self._cache.close()
+            
+    async def _acquire(self) -> bool:
+        """
+        Take a rate limit token, waiting for it when it is due within rate_limit_max_wait
+        seconds. Returns False, taking nothing, when the caller should fall back instead.
+        """
+        async with self._bucket_lock:
+            wait = self._bucket.wait_time()
+            if wait > self.rate_limit_max_wait:
+                return False
+            if wait > 0:
+                await asyncio.sleep(wait)
+                self._bucket.refill()
+            self._bucket.tokens -= 1
+            return True
+            
+    async def _chat_completion(self, messages: List[Dict[str, str]]) -> Any:
+        """Request a chat completion, holding one of the MAX_INFLIGHT request slots"""
+        async with self._sem:
+            return await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                response_format=JSON_RESPONSE_FORMAT
+            )
+            
+    async def analyze_many(self, items: List[Tuple[str, str]]) -> List[Dict]:
+        """Analyze (code, context) pairs with one concurrent analyze_code_segment call each"""
+        return list(await asyncio.gather(*(self.analyze_code_segment(code, context) for code, context in items)))
         
     async def analyze_code_segment(self, code: str, context: str = "") -> Dict:
         """Analyze a code segment using GPT with caching"""
-        cache_key = f"analyze_{hash(code + context)}"
+        return (await self.analyze_code_segments([code], [context]))[0]
+        
+    async def analyze_code_segments(self, codes: List[str], contexts: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Analyze code segments using GPT with caching. Uncached segments are sent
+        max_batch_segments at a time in one chat completion each, so the system
+        prompt and round-trip are paid once per group. Each request counts once
+        against the rate limit. Returns one analysis per segment, in order.
+        """
+        contexts = contexts or [""] * len(codes)
+        cache_keys = [make_key("analyze", code, context) for code, context in zip(codes, contexts)]
         
         # Check cache if enabled
-        if self.cache_dir:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            if cache_file.exists():
-                # Check cache age
-                cache_age = time.time() - cache_file.stat().st_mtime
-                if cache_age < self.cache_ttl:
-                    try:
-                        with open(cache_file, 'r') as f:
-                            return json.load(f)
-                    except json.JSONDecodeError:
-                        # Invalid cache, will recompute
-                        pass
-                        
-        # Check rate limit reset
-        current_time = time.time()
-        if current_time >= self.call_reset_time:
-            self.calls_made = 0
-            self.call_reset_time = current_time + 3600
+        results: List[Optional[Dict]] = await self._load_cached_analyses(cache_keys)
+        
+        # Claim the missing keys no concurrent call is computing yet; segments whose key
+        # is already in flight, here or elsewhere, wait for that analysis instead
+        futures: Dict[str, asyncio.Future] = {}
+        claimed: Dict[str, asyncio.Future] = {}
+        pending = []
+        for i, key in enumerate(cache_keys):
+            if results[i] is not None or key in futures:
+                continue
+            if key in self._inflight:
+                futures[key] = self._inflight[key]
+            else:
+                futures[key] = claimed[key] = self._inflight[key] = asyncio.get_running_loop().create_future()
+                pending.append(i)
+        groups = [pending[start:start + self.max_batch_segments]
+                  for start in range(0, len(pending), self.max_batch_segments)]
+        
+        try:
+            group_results = await asyncio.gather(*(
+                self._analyze_segment_group([codes[i] for i in group], [contexts[i] for i in group])
+                for group in groups
+            ))
+            cacheable_results = {}
+            for group, analyses in zip(groups, group_results):
+                for i, (result, cacheable) in zip(group, analyses):
+                    claimed[cache_keys[i]].set_result(result)
+                    if cacheable:
+                        cacheable_results[cache_keys[i]] = result
+            await self._store_cached_analyses(cacheable_results)
+        finally:
+            for key, future in claimed.items():
+                del self._inflight[key]
+                if not future.done():
+                    future.cancel()
+                    
+        for i, key in enumerate(cache_keys):
+            if results[i] is None:
+                results[i] = await self._await_shared(futures[key])
+        return results
+        
+    async def _singleflight(self, cache_key: str, compute: Callable[[], Awaitable[Dict]]) -> Dict:
+        """Run compute unless a call for cache_key is in flight already, then share its result"""
+        if cache_key in self._inflight:
+            return await self._await_shared(self._inflight[cache_key])
             
-        # Check if next call would exceed rate limit
-        next_count = self.calls_made + 1
-        print(f"GPTAnalyzer: calls_made={self.calls_made}, max_calls={self.max_calls}, next_count={next_count}")
-        if next_count > self.max_calls:
-            print("GPTAnalyzer: Rate limit would be exceeded, returning fallback")
-            logging.warning("GPT API rate limit would be exceeded. Using fallback analysis.")
-            return self._get_fallback_analysis("Rate limit reached")
+        future = self._inflight[cache_key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await compute()
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[cache_key]
+            if not future.done():
+                future.cancel()
+                
+    async def _await_shared(self, future: asyncio.Future) -> Dict:
+        """Wait for another call's analysis without cancelling it if this caller is cancelled"""
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            return self._get_fallback_analysis("Concurrent analysis was cancelled")
+            
+    async def _analyze_segment_group(self, codes: List[str], contexts: List[str]) -> List[Tuple[Dict, bool]]:
+        """
+        Analyze segments with a single chat completion, returning (analysis, cacheable)
+        per segment; failed analyses are fallbacks that are not cached
+        """
+        if not await self._acquire():
+            logging.warning("GPT API rate limit reached. Using fallback analysis.")
+            return [(self._get_fallback_analysis("Rate limit reached"), False)] * len(codes)
             
-        # Increment counter before making the call
-        print(f"GPTAnalyzer: Incrementing calls_made to {next_count}")
-        self.calls_made = next_count
-        
         try:
+            # A single segment keeps the plain one-object request and reply
+            if len(codes) == 1:
+                messages = self._code_analysis_messages(codes[0], contexts[0])
+            else:
+                messages = self._code_segments_messages(codes, contexts)
+                
             # Make API call
-            # Create completion with proper async handling
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": """You are an expert code analyzer focused on:
-1. Identifying AI/ML implementations
-2. Detecting code quality issues
-3. Finding potential plagiarism
-4. Assessing code executability
-
-Provide analysis in JSON format with these keys:
-- ai_score: float 0-1
-- quality_score: float 0-1
-- originality_score: float 0-1
-- execution_score: float 0-1
-- market_value: float 0-1
-- findings: list of strings
-- recommendations: list of strings"""},
-                    {"role": "user", "content": f"Context: {context}\n\nAnalyze this code:\n```\n{code}\n```"}
-                ]
-            )
+            response = await self._chat_completion(messages)
             
-            # Parse the response with better error handling
+            # JSON mode guarantees an object; only a truncated reply fails to parse
+            content = response.choices[0].message.content
             try:
-                content = response.choices[0].message.content
-                # Clean up potential formatting issues
-                content = content.strip()
-                if not content.startswith('{'):
-                    # Try to find the JSON object
-                    start = content.find('{')
-                    end = content.rfind('}')
-                    if start >= 0 and end > start:
-                        content = content[start:end+1]
-                    else:
-                        raise ValueError("No valid JSON object found in response")
-                
-                analysis = json.loads(content)
-                result = {
-                    'ai_score': float(analysis.get('ai_score', 0.5)),
-                    'quality_score': float(analysis.get('quality_score', 0.5)),
-                    'originality_score': float(analysis.get('originality_score', 0.5)),
-                    'execution_score': float(analysis.get('execution_score', 0.5)),
-                    'market_value': float(analysis.get('market_value', 0.5)),
-                    'findings': analysis.get('findings', ["No findings available"]),
-                    'recommendations': analysis.get('recommendations', ["No recommendations available"])
-                }
-            except json.JSONDecodeError as e:
+                if len(codes) == 1:
+                    analyses = [self._parse_code_analysis(content)]
+                else:
+                    analyses = self._parse_code_segments(content, len(codes))
+            except ValueError as e:
                 logging.error(f"Failed to parse GPT response: {e}\nResponse content: {content}")
-                return self._get_fallback_analysis(f"JSON parse error: {str(e)}")
-            except Exception as e:
-                logging.error(f"Error processing GPT response: {e}")
-                return self._get_fallback_analysis(str(e))
-            
-            # Cache the result if caching is enabled
-            if self.cache_dir:
-                try:
-                    with open(self.cache_dir / f"{cache_key}.json", 'w') as f:
-                        json.dump(result, f)
-                except Exception as e:
-                    logging.warning(f"Failed to cache analysis: {e}")
-                    
-            return result
+                return [(self._get_fallback_analysis(f"JSON parse error: {str(e)}"), False)] * len(codes)
+                
+            return [(analysis, True) if analysis is not None
+                    else (self._get_fallback_analysis("No analysis returned for segment"), False)
+                    for analysis in analyses]
             
         except Exception as e:
             logging.error(f"GPT analysis failed: {str(e)}")
-            return self._get_fallback_analysis(str(e))
+            return [(self._get_fallback_analysis(str(e)), False)] * len(codes)
             
-    def _get_fallback_analysis(self, error_msg: str) -> Dict:
-        """Get fallback analysis result when GPT fails"""
-        return {
-            'ai_score': 0.5,
-            'quality_score': 0.5,
-            'originality_score': 0.5,
-            'execution_score': 0.5,
-            'market_value': 0.5,
-            'findings': [f"GPT analysis failed: {error_msg}"] if error_msg else ["No findings available"],
-            'recommendations': ["Enable GPT analysis for enhanced results"]
+    async def analyze_batch(self, segments: List[str], contexts: Optional[List[str]] = None) -> List[float]:
+        """
+        Score code segments with a single OpenAI Batch API job instead of one request each.
+        Cached segments are served from the cache and the rest are uploaded as a JSONL
+        file. Returns one ai_score per segment; segments whose request failed get the
+        fallback score.
+        """
+        contexts = contexts or [""] * len(segments)
+        cache_keys = [self.queue_code_analysis(code, context) for code, context in zip(segments, contexts)]
+        results: Dict[str, Dict] = {}
+        try:
+            batch_id = await self.submit_batch()
+            if batch_id:
+                results = await self.collect_batch(batch_id)
+        except Exception as e:
+            logging.error(f"GPT batch analysis failed: {str(e)}")
+            
+        fallback_score = _FALLBACK_ANALYSIS['ai_score']
+        scores = []
+        for key, cached in zip(cache_keys, await self._load_cached_analyses(cache_keys)):
+            result = results.get(key) or cached
+            scores.append(result['ai_score'] if result else fallback_score)
+        return scores
+        
+    def queue_code_analysis(self, code: str, context: str = "") -> str:
+        """Queue an analyze_code_segment request for the next batch, returning its cache key"""
+        cache_key = make_key("analyze", code, context)
+        self._queue_batch_request(cache_key, self._code_analysis_messages(code, context))
+        return cache_key
+        
+    def queue_ai_verification(self, code: str) -> str:
+        """Queue a verify_ai_implementation request for the next batch, returning its cache key"""
+        cache_key = make_key("verify", code)
+        self._queue_batch_request(cache_key, self._verification_messages(code))
+        return cache_key
+        
+    def queue_originality_check(self, code: str) -> str:
+        """Queue a check_code_originality request for the next batch, returning its cache key"""
+        cache_key = make_key("originality", code)
+        self._queue_batch_request(cache_key, self._originality_messages(code))
+        return cache_key
+        
+    def _queue_batch_request(self, cache_key: str, messages: List[Dict[str, str]]):
+        """Add a chat completion to the pending batch unless it is cached or already queued"""
+        if cache_key in self._batch_requests or (self._cache is not None and self._cache.get(cache_key) is not None):
+            return
+        self._batch_requests[cache_key] = {
+            'custom_id': cache_key,
+            'method': 'POST',
+            'url': '/v1/chat/completions',
+            'body': {'model': self.model, 'messages': messages, 'response_format': JSON_RESPONSE_FORMAT},
         }
         
-
+    async def submit_batch(self) -> Optional[str]:
+        """
+        Upload the queued requests as a JSONL file and start a Batch API job for them.
+        Returns the batch id, None when nothing is queued. Batch jobs run in their own
+        OpenAI rate limit pool, so they do not count against max_calls.
+        """
+        if not self._batch_requests:
+            return None
+        requests = b"\n".join(encode_json(request) for request in self._batch_requests.values())
+        self._batch_requests = {}
         
-    async def verify_ai_implementation(self, code: str) -> Dict:
-        """Specifically verify if code implements real AI/ML functionality with caching"""
-        # Check rate limit reset
-        current_time = time.time()
-        if current_time >= self.call_reset_time:
-            self.calls_made = 0
-            self.call_reset_time = current_time + 3600
+        input_file = await self.client.files.create(
+            file=("analysis_batch.jsonl", requests),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+        
+    async def collect_batch(self, batch_id: str) -> Dict[str, Dict]:
+        """
+        Wait for a Batch API job and return its parsed results by cache key, caching each.
+        Jobs still running after batch_timeout are cancelled and raise TimeoutError.
+        """
+        # Poll with exponential backoff until the job settles or times out
+        deadline = time.monotonic() + self.batch_timeout
+        delay = BATCH_POLL_BASE_DELAY
+        batch = await self.client.batches.retrieve(batch_id)
+        while batch.status not in BATCH_FINAL_STATES:
+            if time.monotonic() >= deadline:
+                await self.client.batches.cancel(batch_id)
+                raise TimeoutError(f"Batch {batch_id} did not finish within {self.batch_timeout}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX_DELAY)
+            batch = await self.client.batches.retrieve(batch_id)
             
-        # Check if we've reached the rate limit
-        if self.calls_made >= self.max_calls:
-            logging.warning("GPT API rate limit reached. Using fallback verification.")
-            return {
-                'is_real_ai': False,
-                'implementation_type': 'unknown',
-                'confidence': 0.0,
-                'evidence': ["Rate limit reached"],
-                'suggestions': ["Try again later"]
-            }
+        if batch.status != 'completed' or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch_id} ended with status {batch.status}")
             
-        # Increment counter for successful calls
-        self.calls_made += 1
+        output = await self.client.files.content(batch.output_file_id)
+        results = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record: Dict[str, Any] = decode_json(line)
+            cache_key = record.get('custom_id', '')
+            try:
+                content = record['response']['body']['choices'][0]['message']['content']
+                if cache_key.startswith('analyze_'):
+                    result = self._parse_code_analysis(content)
+                else:
+                    result = decode_json(content)
+            except Exception as e:
+                logging.error(f"Batch request {cache_key} failed: {record.get('error') or e}")
+                continue
+            results[cache_key] = result
+        await self._store_cached_analyses(results)
+        return results
+        
+    async def _load_cached_analysis(self, cache_key: str) -> Optional[Dict]:
+        """Return a cached analysis that is still within the TTL, None otherwise"""
+        return (await self._load_cached_analyses([cache_key]))[0]
+        
+    async def _load_cached_analyses(self, cache_keys: List[str]) -> List[Optional[Dict]]:
+        """_load_cached_analysis for each key, reading the disk off the event loop"""
+        if self._cache is None:
+            return [None] * len(cache_keys)
+        return await self._cache.get_many(cache_keys)
+        
+    async def _store_cached_analysis(self, cache_key: str, result: Dict):
+        """Cache an analysis result if caching is enabled"""
+        await self._store_cached_analyses({cache_key: result})
+        
+    async def _store_cached_analyses(self, results: Dict[str, Dict]):
+        """Cache analysis results by key, writing the disk off the event loop"""
+        if self._cache is not None:
+            await self._cache.set_many(results)
+                
+    def _code_analysis_messages(self, code: str, context: str) -> List[Dict[str, str]]:
+        """Chat messages asking GPT to analyze one code segment"""
+        return [
+            _CODE_ANALYSIS_SYSTEM,
+            {"role": "user", "content": f"Context: {context}\n\nAnalyze this code:\n```\n{code}\n```"}
+        ]
+        
+    def _code_segments_messages(self, codes: List[str], contexts: List[str]) -> List[Dict[str, str]]:
+        """Chat messages asking GPT to analyze several code segments, identified by list position"""
+        segments = [{"id": i, "code": code, "context": context}
+                    for i, (code, context) in enumerate(zip(codes, contexts))]
+        return [
+            _CODE_SEGMENTS_SYSTEM,
+            {"role": "user", "content": encode_json(segments).decode()}
+        ]
+        
+    def _full_analysis_messages(self, code: str, context: str) -> List[Dict[str, str]]:
+        """Chat messages asking GPT for the analysis, verification and originality of one code segment"""
+        return [
+            _FULL_ANALYSIS_SYSTEM,
+            {"role": "user", "content": f"Context: {context}\n\nAnalyze this code:\n```\n{code}\n```"}
+        ]
+        
+    def _verification_messages(self, code: str) -> List[Dict[str, str]]:
+        """Chat messages asking GPT whether code implements real AI/ML functionality"""
+        return [
+            _AI_VERIFICATION_SYSTEM,
+            {"role": "user", "content": f"Analyze this code for AI implementation:\n```\n{code}\n```"}
+        ]
+        
+    def _originality_messages(self, code: str) -> List[Dict[str, str]]:
+        """Chat messages asking GPT how original code is"""
+        return [
+            _ORIGINALITY_SYSTEM,
+            {"role": "user", "content": f"Analyze this code for originality:\n```\n{code}\n```"}
+        ]
+        
+    def _parse_code_analysis(self, content: str) -> Dict:
+        """Parse a code analysis reply into a result dict, raising if it is not valid JSON"""
+        return self._normalize_code_analysis(decode_json(content))
+        
+    def _parse_code_segments(self, content: str, count: int) -> List[Optional[Dict]]:
+        """Parse a multi-segment reply into results by segment id, None for segments it lacks"""
+        results: List[Optional[Dict]] = [None] * count
+        for analysis in decode_json(content).get('results', []):
+            try:
+                segment_id = int(analysis['id'])
+                if 0 <= segment_id < count:
+                    results[segment_id] = self._normalize_code_analysis(analysis)
+            except (KeyError, TypeError, ValueError) as e:
+                logging.warning(f"Skipping malformed segment analysis: {e}")
+        return results
+        
+    def _normalize_code_analysis(self, analysis: Dict) -> Dict:
+        """Code analysis result dict with every key present and scores as floats"""
+        return {
+            'ai_score': float(analysis.get('ai_score', 0.5)),
+            'quality_score': float(analysis.get('quality_score', 0.5)),
+            'originality_score': float(analysis.get('originality_score', 0.5)),
+            'execution_score': float(analysis.get('execution_score', 0.5)),
+            'market_value': float(analysis.get('market_value', 0.5)),
+            'findings': analysis.get('findings', ["No findings available"]),
+            'recommendations': analysis.get('recommendations', ["No recommendations available"])
+        }
+        
+    def _get_fallback_analysis(self, error_msg: str) -> Dict:
+        """Get fallback analysis result when GPT fails"""
+        if not error_msg:
+            return dict(_FALLBACK_ANALYSIS)
+        return {**_FALLBACK_ANALYSIS, 'findings': [f"GPT analysis failed: {error_msg}"]}
+        
+    def _get_fallback_verification(self, error_msg: str) -> Dict:
+        """Get fallback AI verification result when GPT fails"""
+        return {**_FALLBACK_VERIFICATION, 'evidence': [f"Analysis failed: {error_msg}"]}
+        
+    def _get_fallback_originality(self, error_msg: str) -> Dict:
+        """Get fallback originality check result when GPT fails"""
+        if not error_msg:
+            return dict(_FALLBACK_ORIGINALITY)
+        # The originality schema has no findings, the reason leads the recommendations
+        return {**_FALLBACK_ORIGINALITY,
+                'recommendations': [f"Originality check failed: {error_msg}", *_FALLBACK_ORIGINALITY['recommendations']]}
+        
+    def _get_fallback_part(self, part: str, error_msg: str) -> Dict:
+        """Fallback for one part of an analyze_full result"""
+        if part == 'verification':
+            return self._get_fallback_verification(error_msg)
+        if part == 'originality':
+            return self._get_fallback_originality(error_msg)
+        return self._get_fallback_analysis(error_msg)
+        
 
-        cache_key = f"verify_{hash(code)}"
+        
+    @singleflight(lambda code, context="": make_key("full", code, context))
+    async def analyze_full(self, code: str, context: str = "") -> Dict:
+        """
+        Analyze code, verify its AI implementation and check its originality in one
+        request that sends the code once. Returns {'analysis', 'verification',
+        'originality'}; each part is cached where analyze_code_segment,
+        verify_ai_implementation and check_code_originality look for it.
+        """
+        cache_keys = {
+            'analysis': make_key("analyze", code, context),
+            'verification': make_key("verify", code),
+            'originality': make_key("originality", code),
+        }
         
         # Check cache if enabled
-        if self.cache_dir:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            if cache_file.exists():
-                cache_age = time.time() - cache_file.stat().st_mtime
-                if cache_age < self.cache_ttl:
-                    try:
-                        with open(cache_file, 'r') as f:
-                            return json.load(f)
-                    except json.JSONDecodeError:
-                        pass
-                        
-        try:
-            # Rate limit already checked before this point
-                    
-            # Create completion with proper async handling
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": """You are an expert at identifying genuine AI/ML implementations.
-Focus on distinguishing between:
-1. Real ML model implementations
-2. Basic API calls to AI services
-3. Framework-level AI code
-4. Simple prompt engineering
-
-Provide analysis in JSON format with:
-- is_real_ai: boolean
-- implementation_type: string (framework|api|hybrid|none)
-- confidence: float 0-1
-- evidence: list of strings
-- suggestions: list of strings"""},
-                    {"role": "user", "content": f"Analyze this code for AI implementation:\n```\n{code}\n```"}
-                ]
-            )
-            
-            result = json.loads(response.choices[0].message.content)
+        cached = dict(zip(cache_keys, await self._load_cached_analyses(list(cache_keys.values()))))
+        if all(result is not None for result in cached.values()):
+            return cached
             
-            # Cache the result if caching is enabled
-            if self.cache_dir:
-                try:
-                    with open(self.cache_dir / f"{cache_key}.json", 'w') as f:
-                        json.dump(result, f)
-                except Exception as e:
-                    logging.warning(f"Failed to cache verification: {e}")
-                    
-            return result
+        if not await self._acquire():
+            logging.warning("GPT API rate limit reached. Using fallback analysis.")
+            return {part: cached[part] or self._get_fallback_part(part, "Rate limit reached") for part in cache_keys}
             
+        try:
+            response = await self._chat_completion(self._full_analysis_messages(code, context))
+            reply = decode_json(response.choices[0].message.content)
         except Exception as e:
-            logging.error(f"AI verification failed: {str(e)}")
-            return {
-                'is_real_ai': False,
-                'implementation_type': 'unknown',
-                'confidence': 0.0,
-                'evidence': [f"Analysis failed: {str(e)}"],
-                'suggestions': ["Enable GPT analysis for AI verification"]
-            }
+            logging.error(f"Full analysis failed: {str(e)}")
+            return {part: cached[part] or self._get_fallback_part(part, str(e)) for part in cache_keys}
             
+        results = {}
+        cacheable_results = {}
+        for part, cache_key in cache_keys.items():
+            try:
+                result = dict(reply[part])
+                if part == 'analysis':
+                    result = self._normalize_code_analysis(result)
+            except Exception as e:
+                logging.error(f"Full analysis reply has no valid {part}: {e}")
+                results[part] = cached[part] or self._get_fallback_part(part, f"No {part} returned")
+                continue
+            results[part] = cacheable_results[cache_key] = result
+        await self._store_cached_analyses(cacheable_results)
+        return results
+        
+    async def verify_ai_implementation(self, code: str) -> Dict:
+        """Specifically verify if code implements real AI/ML functionality with caching"""
+        cached = await self._load_cached_analysis(make_key("verify", code))
+        if cached is not None:
+            return cached
+        return (await self.analyze_full(code))['verification']
+        
+    @singleflight(lambda project_name, repo_url: make_key("market", project_name, repo_url))
     async def analyze_market_context(self, project_name: str, repo_url: str) -> Dict:
         """Analyze market context and popularity of a project"""
-        cache_key = f"market_{hash(project_name + repo_url)}"
+        cache_key = make_key("market", project_name, repo_url)
         
         # Check cache if enabled
-        if self.cache_dir:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            if cache_file.exists():
-                cache_age = time.time() - cache_file.stat().st_mtime
-                if cache_age < self.cache_ttl:
-                    try:
-                        with open(cache_file, 'r') as f:
-                            return json.load(f)
-                    except json.JSONDecodeError:
-                        pass
+        cached = await self._load_cached_analysis(cache_key)
+        if cached is not None:
+            return cached
                         
         try:
-            # Create completion with proper async handling
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
-                model="gpt-4",
+            response = await self._chat_completion(
                 messages=[
-                    {"role": "system", "content": """You are an expert at analyzing AI project market success.
-Focus on:
-1. Project popularity (GitHub stars, forks)
-2. Community adoption and engagement
-3. Industry recognition and impact
-4. Market presence and growth
-
-Provide analysis in JSON format with:
-- popularity_score: float 0-1
-- adoption_score: float 0-1
-- impact_score: float 0-1
-- popularity_metrics: object
-- community_metrics: object
-- market_context: string
-- recommendations: list of strings"""},
+                    _MARKET_ANALYSIS_SYSTEM,
                     {"role": "user", "content": f"Analyze market success for project {project_name} ({repo_url})"}
                 ]
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = decode_json(response.choices[0].message.content)
             
             # Cache the result if caching is enabled
-            if self.cache_dir:
-                try:
-                    with open(self.cache_dir / f"{cache_key}.json", 'w') as f:
-                        json.dump(result, f)
-                except Exception as e:
-                    logging.warning(f"Failed to cache market analysis: {e}")
+            await self._store_cached_analysis(cache_key, result)
                     
             return result
             
         except Exception as e:
             logging.error(f"Market analysis failed: {str(e)}")
-            return {
-                'popularity_score': 0.5,
-                'adoption_score': 0.5,
-                'impact_score': 0.5,
-                'popularity_metrics': {},
-                'community_metrics': {},
-                'market_context': f"Analysis failed: {str(e)}",
-                'recommendations': ["Enable GPT analysis for market research"]
-            }
+            return {**_FALLBACK_MARKET_CONTEXT, 'market_context': f"Analysis failed: {str(e)}"}
             
     async def check_code_originality(self, code: str) -> Dict:
         """Use GPT to detect potential code plagiarism or common patterns with caching"""
-        # Check rate limit reset
-        current_time = time.time()
-        if current_time >= self.call_reset_time:
-            self.calls_made = 0
-            self.call_reset_time = current_time + 3600
-            
-        # Check if we've reached the rate limit
-        if self.calls_made >= self.max_calls:
-            logging.warning("GPT API rate limit reached. Using fallback originality check.")
-            return {
-                'originality_score': 0.5,
-                'is_likely_copied': False,
-                'common_patterns': ["Rate limit reached"],
-                'unique_elements': [],
-                'recommendations': ["Try again later"]
-            }
-            
-        # Increment counter for successful calls
-        self.calls_made += 1
-
-        cache_key = f"originality_{hash(code)}"
-        
-        # Check cache if enabled
-        if self.cache_dir:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            if cache_file.exists():
-                cache_age = time.time() - cache_file.stat().st_mtime
-                if cache_age < self.cache_ttl:
-                    try:
-                        with open(cache_file, 'r') as f:
-                            return json.load(f)
-                    except json.JSONDecodeError:
-                        pass
-                        
-        try:
-            # Rate limit already checked before this point
-                    
-            # Create completion with proper async handling
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": """You are an expert at identifying code originality and potential plagiarism.
-Focus on:
-1. Common code patterns vs unique implementations
-2. Framework-specific boilerplate
-3. Copied documentation or comments
-4. Unique algorithmic approaches
-
-Provide analysis in JSON format with:
-- originality_score: float 0-1
-- is_likely_copied: boolean
-- common_patterns: list of strings
-- unique_elements: list of strings
-- recommendations: list of strings"""},
-                    {"role": "user", "content": f"Analyze this code for originality:\n```\n{code}\n```"}
-                ]
-            )
-            
-            result = json.loads(response.choices[0].message.content)
-            
-            # Cache the result if caching is enabled
-            if self.cache_dir:
-                try:
-                    with open(self.cache_dir / f"{cache_key}.json", 'w') as f:
-                        json.dump(result, f)
-                except Exception as e:
-                    logging.warning(f"Failed to cache originality check: {e}")
-                    
-            return result
-            
-        except Exception as e:
-            logging.error(f"Originality check failed: {str(e)}")
-            return {
-                'originality_score': 0.5,
-                'is_likely_copied': False,
-                'common_patterns': [],
-                'unique_elements': [],
-                'recommendations': ["Enable GPT analysis for originality verification"]
-            }
+        cached = await self._load_cached_analysis(make_key("originality", code))
+        if cached is not None:
+            return cached
+        return (await self.analyze_full(code))['originality']
@@ -1,7 +1,15 @@
-from typing import Dict, List
+from typing import Dict, List, Sequence, Tuple
 from dataclasses import dataclass
 from .code_analyzer import AnalysisResult
 
+try:
+    import numpy as np
+except ImportError:  # Optional accelerator, batch summaries are scored one by one instead
+    np = None
+
+# Batches at least this large are scored with numpy when it is installed
+VECTORIZE_MIN_RESULTS = 64
+
 @dataclass
 class Report:
     overall_score: float
@@ -17,18 +25,37 @@ class ReportGenerator:
         
     def generate_summary(self) -> Report:
         """Generate a summary report with market value metrics"""
+        overall_score, score_override = self._overall_score(self.result)
+        return self._build_report(self.result, overall_score, score_override)
+        
+    @classmethod
+    def generate_summaries(cls, results: Sequence[AnalysisResult]) -> List[Report]:
+        """
+        Generate summary reports for many analysis results, as generate_summary would
+        for each. Large batches are scored with vectorized numpy arithmetic.
+        """
+        if np is None or len(results) < VECTORIZE_MIN_RESULTS:
+            scores = [cls._overall_score(result) for result in results]
+        else:
+            scores = zip(*cls._overall_scores(results))
+        return [cls._build_report(result, overall_score, bool(score_override))
+                for result, (overall_score, score_override) in zip(results, scores)]
+        
+    @staticmethod
+    def _overall_score(result: AnalysisResult) -> Tuple[float, bool]:
+        """Overall score of one result, and whether the high market value floor raised it"""
         # Get valid base scores (non-zero)
         base_scores = [
             score for score in [
-                self.result.ai_framework_score,
-                self.result.code_quality_score,
-                self.result.execution_score,
-                self.result.security_score
+                result.ai_framework_score,
+                result.code_quality_score,
+                result.execution_score,
+                result.security_score
             ] if score > 0
         ]
         
         # Calculate market contribution (always exactly 30%)
-        market_contribution = self.result.market_value_score * 0.3
+        market_contribution = result.market_value_score * 0.3
         score_override = False
         
         # Calculate base score (up to 70%)
@@ -40,7 +67,7 @@ class ReportGenerator:
             
             # For high market success (>= 0.8), ensure minimum total score of 0.5
             # but only if we have valid base scores
-            if self.result.market_value_score >= 0.8:
+            if result.market_value_score >= 0.8:
                 # Calculate minimum required base score
                 min_base = 0.5 - market_contribution
                 base_score = max(base_score, min_base)
@@ -50,19 +77,42 @@ class ReportGenerator:
             base_score = 0.0
         
         # Calculate total score (market value always contributes exactly 30%)
-        overall_score = base_score + market_contribution
+        return base_score + market_contribution, score_override
+        
+    @staticmethod
+    def _overall_scores(results: Sequence[AnalysisResult]) -> Tuple[List[float], List[bool]]:
+        """_overall_score for every result at once, as numpy array operations"""
+        scores = np.array([
+            [result.ai_framework_score, result.code_quality_score, result.execution_score, result.security_score]
+            for result in results
+        ], dtype=np.float64)
+        market = np.array([result.market_value_score for result in results], dtype=np.float64)
+        
+        # Mean of the non-zero base scores, weighted 70%; zero when there are none
+        valid = scores > 0
+        counts = valid.sum(axis=1)
+        base = np.where(valid, scores, 0.0).sum(axis=1) / np.maximum(counts, 1) * 0.7
+        
+        # High market success floors the total at 0.5, only with valid base scores
+        market_contribution = market * 0.3
+        score_override = (counts > 0) & (market >= 0.8)
+        base = np.where(score_override, np.maximum(base, 0.5 - market_contribution), base)
+        return (base + market_contribution).tolist(), score_override.tolist()
         
+    @staticmethod
+    def _build_report(result: AnalysisResult, overall_score: float, score_override: bool) -> Report:
+        """Summary report of a result with its overall score"""
         # Prepare detailed scores with exact values from analysis
         detailed_scores = {
-            'AI Framework Integration': self.result.ai_framework_score,
-            'Code Quality': self.result.code_quality_score,
-            'Execution Performance': self.result.execution_score,
-            'Market Success': self.result.market_value_score,  # Use exact market value score
-            'Code Originality': self.result.security_score  # Using security score for originality
+            'AI Framework Integration': result.ai_framework_score,
+            'Code Quality': result.code_quality_score,
+            'Execution Performance': result.execution_score,
+            'Market Success': result.market_value_score,  # Use exact market value score
+            'Code Originality': result.security_score  # Using security score for originality
         }
         
         # Add override notification if applied
-        recommendations = list(self.result.recommendations)
+        recommendations = list(result.recommendations)
         if score_override:
             recommendations.insert(0, 
                 "NOTE: Project score was adjusted to minimum 5.0/10 due to high market success")
@@ -70,7 +120,7 @@ class ReportGenerator:
         return Report(
             overall_score=overall_score,
             detailed_scores=detailed_scores,
-            issues=self.result.issues,
+            issues=result.issues,
             recommendations=recommendations
         )
         
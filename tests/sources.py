@@ -0,0 +1,10 @@
+"""Source snippets shared by the detector and end-to-end analysis tests"""
+
+TENSORFLOW_SRC = """
+import tensorflow as tf
+model = tf.keras.Sequential()
+"""
+PYTORCH_SRC = """
+import torch
+import torch.nn as nn
+"""
@@ -1,14 +1,8 @@
 import pytest
+from analyzer import authenticity_detector as authenticity_detector_module
 from analyzer.authenticity_detector import AuthenticityDetector
 import os
-import tempfile
-import shutil
-
-@pytest.fixture
-def temp_repo():
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir)
+from tests.sources import TENSORFLOW_SRC, PYTORCH_SRC
 
 @pytest.fixture
 def authenticity_detector(temp_repo):
@@ -19,40 +13,110 @@ def create_test_file(repo_path: str, content: str, filename: str = "test.py"):
     file_path = os.path.join(repo_path, filename)
     with open(file_path, "w") as f:
         f.write(content)
+    return file_path
 
 @pytest.mark.asyncio
-async def test_detect_tensorflow(temp_repo, authenticity_detector):
-    create_test_file(temp_repo, """
+@pytest.mark.parametrize("code, expect", [
+    pytest.param(TENSORFLOW_SRC, lambda score: score > 0, id="tensorflow"),
+    pytest.param(PYTORCH_SRC, lambda score: score > 0, id="pytorch"),
+    pytest.param("""
+import json
+data = {"test": "data"}
+""", lambda score: score == 0, id="no_ai"),
+    # Should detect multiple frameworks
+    pytest.param("""
 import tensorflow as tf
-model = tf.keras.Sequential()
-""")
+import torch
+from transformers import AutoModel
+""", lambda score: score > 0.5, id="multiple_frameworks"),
+])
+async def test_detect(temp_repo, authenticity_detector, code, expect):
+    create_test_file(temp_repo, code)
     score = await authenticity_detector.analyze_authenticity()
-    assert score > 0
+    assert expect(score)
 
 @pytest.mark.asyncio
-async def test_detect_pytorch(temp_repo, authenticity_detector):
-    create_test_file(temp_repo, """
+async def test_skips_vendored_directories(temp_repo, authenticity_detector):
+    os.makedirs(os.path.join(temp_repo, "node_modules"))
+    create_test_file(temp_repo, TENSORFLOW_SRC, os.path.join("node_modules", "vendored.py"))
+    score = await authenticity_detector.analyze_authenticity()
+    assert score == 0
+
+@pytest.mark.skipif(authenticity_detector_module._HYPERSCAN is None, reason="hyperscan not installed")
+def test_hyperscan_matches_re_backend(monkeypatch):
+    content = b"""
 import torch
 import torch.nn as nn
-""")
-    score = await authenticity_detector.analyze_authenticity()
-    assert score > 0
+class Net(nn.Module):
+    def forward(self, x):
+        return torch.cuda.is_available()
+"""
+    accelerated = authenticity_detector_module._count_matches(content)
+    monkeypatch.setattr(authenticity_detector_module, "_HYPERSCAN", None)
+    assert authenticity_detector_module._count_matches(content) == accelerated
 
 @pytest.mark.asyncio
-async def test_detect_no_ai(temp_repo, authenticity_detector):
-    create_test_file(temp_repo, """
-import json
-data = {"test": "data"}
-""")
-    score = await authenticity_detector.analyze_authenticity()
-    assert score == 0
+async def test_unchanged_files_reuse_cached_scan(temp_repo, authenticity_detector, monkeypatch, tmp_path):
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', str(tmp_path / "cache"))
+    create_test_file(temp_repo, PYTORCH_SRC)
+    first = await authenticity_detector.analyze_authenticity()
+
+    def fail_scan(path):
+        raise AssertionError(f"{path} should have been served from cache")
+
+    monkeypatch.setattr(authenticity_detector_module, "_scan_file", fail_scan)
+    assert await authenticity_detector.analyze_authenticity() == first
+
+def test_large_files_scan_like_small_files(temp_repo):
+    code = PYTORCH_SRC
+    small = create_test_file(temp_repo, code, "small.py")
+    padding = "#" * authenticity_detector_module.MMAP_MIN_BYTES + "\n"
+    large = create_test_file(temp_repo, padding + code, "large.py")
+    assert authenticity_detector_module._scan_file(large) == authenticity_detector_module._scan_file(small)
+
+def test_identical_files_are_scanned_once(temp_repo, monkeypatch):
+    code = PYTORCH_SRC
+    paths = [create_test_file(temp_repo, code, name) for name in ("a.py", "b.py")]
+    scanned = []
+    count_matches = authenticity_detector_module._count_matches
+
+    def counting(content):
+        scanned.append(content)
+        return count_matches(content)
+
+    monkeypatch.setattr(authenticity_detector_module, "_count_matches", counting)
+    first, second = authenticity_detector_module._scan_chunk(paths)
+    assert first == second
+    assert len(scanned) == 1
 
 @pytest.mark.asyncio
-async def test_detect_multiple_frameworks(temp_repo, authenticity_detector):
-    create_test_file(temp_repo, """
-import tensorflow as tf
-import torch
-from transformers import AutoModel
-""")
-    score = await authenticity_detector.analyze_authenticity()
-    assert score > 0.5  # Should detect multiple frameworks
+async def test_repositories_do_not_share_cached_scans(tmp_path_factory, monkeypatch, tmp_path):
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', str(tmp_path / "cache"))
+    repos = [str(tmp_path_factory.mktemp("repo")) for _ in range(2)]
+    # Same relative path, size and mtime, only the first one uses AI
+    paths = [create_test_file(repos[0], "import torch\n", "m.py"),
+             create_test_file(repos[1], "import numpy\n", "m.py")]
+    for path in paths:
+        os.utime(path, ns=(0, 0))
+    assert await AuthenticityDetector(repos[0]).analyze_authenticity() > 0
+    assert await AuthenticityDetector(repos[1]).analyze_authenticity() == 0
+
+@pytest.mark.asyncio
+async def test_scan_cache_only_keeps_files_of_existing_repositories(tmp_path_factory, monkeypatch, tmp_path):
+    import shelve
+    import shutil
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', str(tmp_path / "cache"))
+    repo, removed = (str(tmp_path_factory.mktemp("repo")) for _ in range(2))
+    create_test_file(removed, PYTORCH_SRC)
+    await AuthenticityDetector(removed).analyze_authenticity()
+    shutil.rmtree(removed)
+    
+    deleted = create_test_file(repo, PYTORCH_SRC, "deleted.py")
+    create_test_file(repo, TENSORFLOW_SRC, "kept.py")
+    await AuthenticityDetector(repo).analyze_authenticity()
+    os.remove(deleted)
+    await AuthenticityDetector(repo).analyze_authenticity()
+    
+    with shelve.open(str(tmp_path / "cache" / "authenticity_scan")) as cache:
+        assert list(cache) == [repo]
+        assert list(cache[repo]) == ["kept.py"]
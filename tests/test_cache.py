@@ -0,0 +1,85 @@
+import pytest
+from analyzer import _cache
+from analyzer._cache import DiskCache
+
+def test_entries_persist_across_instances(tmp_path):
+    path = tmp_path / "cache.db"
+    DiskCache(path, ttl=60).set("analyze_1", {'ai_score': 0.8})
+    assert DiskCache(path, ttl=60).get("analyze_1") == {'ai_score': 0.8}
+    assert DiskCache(path, ttl=60).get("analyze_2") is None
+
+def test_expired_entries_are_misses(tmp_path, monkeypatch):
+    cache = DiskCache(tmp_path / "cache.db", ttl=60)
+    cache.set("analyze_1", {'ai_score': 0.8})
+    now = _cache.time.time()
+    monkeypatch.setattr(_cache.time, "time", lambda: now + 60)
+    assert cache.get("analyze_1") is None
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_hits_return_independent_copies(tmp_path, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(_cache, "orjson", None)
+    cache = DiskCache(tmp_path / "cache.db", ttl=60)
+    cache.set("analyze_1", {'findings': ["Good AI implementation"]})
+    cache.get("analyze_1")['findings'].append("mutated by caller")
+    assert cache.get("analyze_1") == {'findings': ["Good AI implementation"]}
+
+def test_memory_layer_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(_cache, "MEMORY_MAX_ENTRIES", 2)
+    cache = DiskCache(tmp_path / "cache.db", ttl=60)
+    for i in range(3):
+        cache.set(f"analyze_{i}", {'ai_score': i})
+    assert list(cache._mem) == ["analyze_1", "analyze_2"]
+    assert cache.get("analyze_0") == {'ai_score': 0}
+
+async def test_async_access_reads_disk_off_the_loop_only_on_memory_misses(tmp_path, monkeypatch):
+    path = tmp_path / "cache.db"
+    await DiskCache(path, ttl=60).set_many({"analyze_1": {'ai_score': 0.8}, "analyze_2": {'ai_score': 0.2}})
+    
+    cache = DiskCache(path, ttl=60)
+    thread_calls = []
+    to_thread = _cache.asyncio.to_thread
+    async def counting_to_thread(func, *args):
+        thread_calls.append(args)
+        return await to_thread(func, *args)
+    monkeypatch.setattr(_cache.asyncio, "to_thread", counting_to_thread)
+    
+    assert await cache.get_many(["analyze_1", "analyze_2", "analyze_3"]) == [{'ai_score': 0.8}, {'ai_score': 0.2}, None]
+    assert thread_calls == [(["analyze_1", "analyze_2", "analyze_3"],)]
+    assert await cache.get_many(["analyze_2", "analyze_1"]) == [{'ai_score': 0.2}, {'ai_score': 0.8}]
+    assert len(thread_calls) == 1
+
+def test_keys_are_stable_across_processes():
+    import os, subprocess, sys
+    src_dir = os.path.dirname(os.path.dirname(_cache.__file__))
+    script = "from analyzer._cache import make_key; print(make_key('analyze', 'import torch', 'ctx'))"
+    other = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                           env={'PYTHONPATH': src_dir, 'PYTHONHASHSEED': 'random'})
+    assert other.stdout.strip() == _cache.make_key("analyze", "import torch", "ctx")
+    assert _cache.make_key("analyze", "ab", "c") != _cache.make_key("analyze", "a", "bc")
+
+def test_session_cache_lives_in_pytest_temp_dir(tmp_path_factory):
+    import os
+    from pathlib import Path
+    cache_path = Path(os.environ['GPT_ANALYSIS_CACHE_PATH'])
+    assert cache_path.is_relative_to(tmp_path_factory.getbasetemp())
+
+def test_expired_rows_are_deleted_on_open(tmp_path, monkeypatch):
+    path = tmp_path / "cache.db"
+    cache = DiskCache(path, ttl=60)
+    cache.set("analyze_1", {'ai_score': 0.8})
+    cache.close()
+    now = _cache.time.time()
+    monkeypatch.setattr(_cache.time, "time", lambda: now + 60)
+    DiskCache(path, ttl=60).set("analyze_2", {'ai_score': 0.2})
+    
+    reopened = DiskCache(path, ttl=60)
+    assert [key for key, in reopened._db.execute("SELECT key FROM cache")] == ["analyze_2"]
+    reopened.close()
+
+def test_closed_cache_misses_instead_of_raising(tmp_path):
+    cache = DiskCache(tmp_path / "cache.db", ttl=60)
+    cache.close()
+    cache.set("analyze_1", {'ai_score': 0.8})
+    cache._mem.clear()
+    assert cache.get("analyze_1") is None
@@ -1,14 +1,6 @@
 import pytest
 from analyzer.execution_verifier import ExecutionVerifier
 import os
-import tempfile
-import shutil
-
-@pytest.fixture
-def temp_repo():
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir)
 
 @pytest.fixture
 def execution_verifier(temp_repo):
@@ -20,6 +12,11 @@ def create_test_file(repo_path: str, content: str, filename: str = "test.py"):
     with open(file_path, "w") as f:
         f.write(content)
 
+def create_test_files(repo_path: str, files: dict):
+    """Helper to create several test files from a {filename: content} mapping"""
+    for filename, content in files.items():
+        create_test_file(repo_path, content, filename)
+
 @pytest.mark.asyncio
 async def test_valid_syntax(temp_repo, execution_verifier):
     create_test_file(temp_repo, """
@@ -40,8 +37,77 @@ def test_function()
 
 @pytest.mark.asyncio
 async def test_multiple_files(temp_repo, execution_verifier):
-    create_test_file(temp_repo, "def func1(): pass", "file1.py")
-    create_test_file(temp_repo, "def func2(): pass", "file2.py")
-    create_test_file(temp_repo, "invalid python code", "file3.py")
+    create_test_files(temp_repo, {
+        "file1.py": "def func1(): pass",
+        "file2.py": "def func2(): pass",
+        "file3.py": "invalid python code",
+    })
     score = await execution_verifier.verify_execution()
     assert 0 < score < 1  # Some files valid, some invalid
+
+@pytest.mark.asyncio
+async def test_process_pool_matches_serial_checks(temp_repo, execution_verifier, monkeypatch):
+    from analyzer import execution_verifier as execution_verifier_module
+    create_test_files(temp_repo, {
+        f"file{i}.py": "import torch\nmodel.predict(x)\n" if i % 2 else "def broken(:\n" for i in range(8)
+    })
+    serial = await execution_verifier.verify_execution()
+    monkeypatch.setattr(execution_verifier_module, "PARALLEL_MIN_FILES", 1)
+    assert await execution_verifier.verify_execution() == serial
+
+@pytest.mark.asyncio
+async def test_skips_vendored_directories(temp_repo, execution_verifier):
+    create_test_file(temp_repo, """
+def test_function():
+    return "Hello, World!"
+""")
+    os.makedirs(os.path.join(temp_repo, ".venv"))
+    create_test_file(temp_repo, "def broken(\n", os.path.join(".venv", "vendored.py"))
+    assert await execution_verifier._source_paths(('.py',)) == [os.path.join(temp_repo, "test.py")]
+
+@pytest.mark.asyncio
+async def test_tree_is_walked_once_per_verification(temp_repo, execution_verifier, monkeypatch):
+    from analyzer import execution_verifier as execution_verifier_module
+    create_test_files(temp_repo, {"model.py": "model.predict(x)\n", "lib.rs": "fn forward() {}\n"})
+    walks = []
+    list_sources = execution_verifier_module._list_sources
+    monkeypatch.setattr(execution_verifier_module, "_list_sources",
+                        lambda repo_path: walks.append(repo_path) or list_sources(repo_path))
+    await execution_verifier.verify_execution()
+    assert walks == [temp_repo]
+    assert await execution_verifier._source_paths(('.py',)) == [os.path.join(temp_repo, "model.py")]
+
+@pytest.mark.asyncio
+async def test_syntax_check_skips_empty_and_oversized_files(temp_repo, execution_verifier, monkeypatch):
+    from analyzer import execution_verifier as execution_verifier_module
+    monkeypatch.setattr(execution_verifier_module, "SYNTAX_MAX_BYTES", 64)
+    create_test_file(temp_repo, "def valid():\n    return 1\n", "valid.py")
+    create_test_file(temp_repo, "", "empty.py")
+    create_test_file(temp_repo, "def generated(:\n" + "#" * 64, "generated.py")
+    with open(os.path.join(temp_repo, "latin1.py"), "wb") as f:
+        f.write("name = 'caf\xe9'\n".encode("latin-1"))
+    assert await execution_verifier._check_syntax() == 0.5
+
+@pytest.mark.asyncio
+async def test_identical_sources_are_parsed_once(temp_repo, execution_verifier, monkeypatch):
+    from collections import OrderedDict
+    from analyzer import execution_verifier as execution_verifier_module
+    monkeypatch.setattr(execution_verifier_module, "_syntax_cache", OrderedDict())
+    parsed = []
+    parse = execution_verifier_module.ast.parse
+    monkeypatch.setattr(execution_verifier_module.ast, "parse", lambda source: parsed.append(source) or parse(source))
+    create_test_files(temp_repo, {
+        "copy0.py": "def func(): pass",
+        "copy1.py": "def func(): pass",
+        "copy2.py": "def func(): pass",
+        "broken.py": "def broken(:\n",
+    })
+    assert await execution_verifier._check_syntax() == 0.75
+    assert await execution_verifier._check_syntax() == 0.75
+    assert sorted(parsed) == [b"def broken(:\n", b"def func(): pass"]
+
+def test_analyzers_share_one_process_pool_without_fork():
+    from analyzer import _workers
+    pool = _workers.process_pool()
+    assert _workers.process_pool() is pool
+    assert pool._mp_context.get_start_method() != "fork"
@@ -1,31 +1,33 @@
 import pytest
 import os
-import sys
 import json
 import time
-import tempfile
 import asyncio
-from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock, AsyncMock
 
-# Add project root to Python path
-project_root = str(Path(__file__).parent.parent)
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
 from analyzer.gpt_analyzer import GPTAnalyzer
 
 # Enable asyncio test mode
 pytestmark = pytest.mark.asyncio
 
+class FakeClock:
+    """Wall clock that only moves when a test advances it"""
+    def __init__(self, start):
+        self.now = start
+        
+    def time(self):
+        return self.now
+        
+    def advance(self, seconds):
+        self.now += seconds
+
 @pytest.fixture
-def temp_cache_dir():
-    """Create temporary directory for cache testing"""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    # Cleanup
-    import shutil
-    shutil.rmtree(temp_dir)
+def fake_time(monkeypatch):
+    """Replace time.time, as read by the cache, with a FakeClock"""
+    clock = FakeClock(time.time())
+    monkeypatch.setattr(time, "time", clock.time)
+    return clock
 
 class MockMessage:
     def __init__(self, content):
@@ -39,123 +41,82 @@ class MockResponse:
     def __init__(self, choices):
         self.choices = choices
 
+def mock_response(findings, recommendations, score=0.5):
+    """MockResponse carrying a serialized code analysis"""
+    content = {
+        'ai_score': score,
+        'quality_score': score,
+        'originality_score': score,
+        'execution_score': score,
+        'market_value': score,
+        'findings': findings,
+        'recommendations': recommendations
+    }
+    return MockResponse([MockChoice(MockMessage(json.dumps(content)))])
+
+# Responses shared by every MockHandler, serialized once
+SUCCESS_RESPONSE = MockResponse([MockChoice(MockMessage(json.dumps({
+    'ai_score': 0.8,
+    'quality_score': 0.7,
+    'originality_score': 0.9,
+    'execution_score': 0.6,
+    'market_value': 0.85,
+    'findings': ["Good AI implementation"],
+    'recommendations': ["Consider optimizing further"]
+})))])
+RATE_LIMIT_RESPONSE = mock_response(["GPT analysis failed: Rate limit exceeded"], ["Try again later"])
+
 class MockHandler:
     """Mock handler for OpenAI API calls"""
     def __init__(self):
-        self._call_count = 0
+        self.call_count = 0
         self.max_calls = int(os.getenv('MAX_GPT_CALLS', '5'))
         self.error_mode = False
         self.error_message = None
-        self.reset_time = time.time() + 3600
-        self.cache = {}  # Add cache for tracking calls
-        self.chat = MagicMock()
-        self.chat.completions = MagicMock()
-        self.chat.completions.create = self.create
-        print(f"MockHandler initialized with max_calls={self.max_calls}, reset_time={self.reset_time}")
-        
-    @property
-    def call_count(self):
-        return self._call_count
+        self.reset_time = time.monotonic() + 3600
+        self._error_responses = {}  # Error responses by message, serialized once
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
         
     async def create(self, *args, **kwargs):
         """Mock OpenAI API call with rate limiting"""
-        try:
-            # Check rate limit reset
-            current_time = time.time()
-            if current_time >= self.reset_time:
-                print(f"MockHandler: Resetting call count (was {self._call_count})")
-                self._call_count = 0  # Reset counter
-                self.reset_time = current_time + 3600
-                
-            # Check if next call would exceed rate limit
-            next_count = self._call_count + 1
-            if next_count > self.max_calls:
-                print(f"MockHandler: Rate limit would be exceeded ({next_count} > {self.max_calls})")
-                content = {
-                    'ai_score': 0.5,
-                    'quality_score': 0.5,
-                    'originality_score': 0.5,
-                    'execution_score': 0.5,
-                    'market_value': 0.5,
-                    'findings': ["GPT analysis failed: Rate limit exceeded"],
-                    'recommendations': ["Try again later"]
-                }
-                return MockResponse([MockChoice(MockMessage(json.dumps(content)))])
+        # Check rate limit reset
+        current_time = time.monotonic()
+        if current_time >= self.reset_time:
+            self.call_count = 0  # Reset counter
+            self.reset_time = current_time + 3600
             
-            # Increment counter for valid calls
-            self._call_count = next_count
-            print(f"MockHandler: call_count incremented to {self._call_count}")
+        # Check if next call would exceed rate limit
+        if self.call_count >= self.max_calls:
+            return RATE_LIMIT_RESPONSE
             
-            if self.error_mode:
-                error_msg = self.error_message or 'API Error'
-                content = {
-                    'ai_score': 0.5,
-                    'quality_score': 0.5,
-                    'originality_score': 0.5,
-                    'execution_score': 0.5,
-                    'market_value': 0.5,
-                    'findings': [f"GPT analysis failed: {error_msg}"],
-                    'recommendations': ["Check error handling"]
-                }
-                return MockResponse([MockChoice(MockMessage(json.dumps(content)))])
+        # Increment counter for valid calls
+        self.call_count += 1
+        
+        if self.error_mode:
+            error_msg = self.error_message or 'API Error'
+            if error_msg not in self._error_responses:
+                self._error_responses[error_msg] = mock_response(
+                    [f"GPT analysis failed: {error_msg}"], ["Check error handling"])
+            return self._error_responses[error_msg]
             
-            # Return normal response for successful calls
-            print(f"MockHandler: Returning normal response (call {self._call_count}/{self.max_calls})")
-            content = {
-                'ai_score': 0.8,
-                'quality_score': 0.7,
-                'originality_score': 0.9,
-                'execution_score': 0.6,
-                'market_value': 0.85,
-                'findings': ["Good AI implementation"],
-                'recommendations': ["Consider optimizing further"]
-            }
-            return MockResponse([MockChoice(MockMessage(json.dumps(content)))])
-        except Exception as e:
-            print(f"MockHandler: Error in create: {e}")
-            # Return fallback response on error
-            content = {
-                'ai_score': 0.5,
-                'quality_score': 0.5,
-                'originality_score': 0.5,
-                'execution_score': 0.5,
-                'market_value': 0.5,
-                'findings': [f"GPT analysis failed: {str(e)}"],
-                'recommendations': ["Try again later"]
-            }
-            return MockResponse([MockChoice(MockMessage(json.dumps(content)))])
+        return SUCCESS_RESPONSE
         
     def set_error_mode(self, enabled=True, message=None):
         self.error_mode = enabled
         self.error_message = message
-        
-    def get_call_count(self):
-        return self._call_count
 
 @pytest.fixture
 def mock_handler():
     """Create mock handler for OpenAI API calls"""
     return MockHandler()
 
-@pytest.fixture(autouse=True)
-def mock_openai(monkeypatch, mock_handler):
-    """Mock OpenAI client"""
-    from analyzer.gpt_analyzer import set_test_mock
-    
-    # Set up both the OpenAI mock and our test mock
-    monkeypatch.setattr("openai.OpenAI", lambda api_key=None: mock_handler)
-    set_test_mock(mock_handler)
-    
-    return mock_handler
-
-async def test_cache_hit(temp_cache_dir, mock_handler):
+async def test_cache_hit(temp_cache_dir, mock_handler, monkeypatch):
     """Test that cached results are returned without calling GPT"""
     # Setup
-    os.environ['OPENAI_API_KEY'] = 'test-key'
-    os.environ['GPT_ANALYSIS_CACHE_PATH'] = temp_cache_dir
-    os.environ['MAX_GPT_CALLS'] = '5'
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    monkeypatch.setenv('MAX_GPT_CALLS', '5')
     
-    analyzer = GPTAnalyzer()
+    analyzer = GPTAnalyzer(client=mock_handler)
     test_code = "def test(): pass"
     
     # First call should use GPT
@@ -168,15 +129,15 @@ async def test_cache_hit(temp_cache_dir, mock_handler):
     assert mock_handler.call_count == 1, "Cache hit should not increment counter"
     assert result1 == result2, "Cache hit should return same result"
 
-async def test_cache_ttl(temp_cache_dir, mock_handler):
+@pytest.mark.parametrize("ttl", [1, 3600])
+async def test_cache_ttl(temp_cache_dir, mock_handler, fake_time, monkeypatch, ttl):
     """Test that expired cache entries trigger new GPT calls"""
-    # Setup with very short TTL
-    os.environ['OPENAI_API_KEY'] = 'test-key'
-    os.environ['GPT_ANALYSIS_CACHE_PATH'] = temp_cache_dir
-    os.environ['GPT_CACHE_TTL'] = '1'  # 1 second TTL
-    os.environ['MAX_GPT_CALLS'] = '5'
+    # Setup
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    monkeypatch.setenv('GPT_CACHE_TTL', str(ttl))
+    monkeypatch.setenv('MAX_GPT_CALLS', '5')
     
-    analyzer = GPTAnalyzer()
+    analyzer = GPTAnalyzer(client=mock_handler)
     test_code = "def test(): pass"
     
     # First call
@@ -184,23 +145,24 @@ async def test_cache_ttl(temp_cache_dir, mock_handler):
     assert mock_handler.call_count == 1, "First call should increment counter"
     assert result1['ai_score'] == 0.8, "First call should return normal response"
     
-    # Wait for cache to expire
-    await asyncio.sleep(2)
+    # Entries are served until the TTL has passed
+    fake_time.advance(ttl - 0.5)
+    assert await analyzer.analyze_code_segment(test_code) == result1
+    assert mock_handler.call_count == 1, "Fresh cache entry should not trigger a call"
+    fake_time.advance(1)
     
     # Second call should trigger new GPT call
     result2 = await analyzer.analyze_code_segment(test_code)
     assert mock_handler.call_count == 2, "Expired cache should trigger new call"
     assert result2['ai_score'] == 0.8, "Second call should return normal response"
 
-async def test_rate_limit(temp_cache_dir, mock_handler):
+async def test_rate_limit(temp_cache_dir, mock_handler, monkeypatch):
     """Test that rate limiting prevents excessive GPT calls"""
     # Setup with low rate limit (2 calls max)
-    os.environ.clear()  # Clear any existing environment variables
-    os.environ['OPENAI_API_KEY'] = 'test-key'
-    os.environ['GPT_ANALYSIS_CACHE_PATH'] = temp_cache_dir
-    os.environ['MAX_GPT_CALLS'] = '2'
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    monkeypatch.setenv('MAX_GPT_CALLS', '2')
     
-    analyzer = GPTAnalyzer()
+    analyzer = GPTAnalyzer(client=mock_handler)
     
     # First call - should succeed (count = 1)
     result1 = await analyzer.analyze_code_segment("def test1(): pass")
@@ -217,44 +179,164 @@ async def test_rate_limit(temp_cache_dir, mock_handler):
     assert result3['ai_score'] == 0.5, "Rate limited call should return fallback"
     assert mock_handler.call_count == 2, "Call count should not increment for rate limited calls"
 
-async def test_rate_limit_reset(temp_cache_dir, mock_handler):
-    """Test that rate limit counter resets after an hour"""
+async def test_rate_limit_reset(temp_cache_dir, mock_handler, monkeypatch):
+    """Test that rate limit tokens refill over time"""
     # Setup
-    os.environ['OPENAI_API_KEY'] = 'test-key'
-    os.environ['GPT_ANALYSIS_CACHE_PATH'] = temp_cache_dir
-    os.environ['MAX_GPT_CALLS'] = '1'
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    monkeypatch.setenv('MAX_GPT_CALLS', '1')
     
-    analyzer = GPTAnalyzer()
+    analyzer = GPTAnalyzer(client=mock_handler)
     
     # Use up rate limit
     result1 = await analyzer.analyze_code_segment("def test1(): pass")
     assert mock_handler.call_count == 1, "First call should increment counter"
     assert result1['ai_score'] == 0.8, "First call should return normal response"
     
-    # Simulate time passing
-    analyzer.call_reset_time = 0  # Force reset
+    # Simulate an hour passing
+    analyzer._bucket.last -= 3600
     
     # Should be able to make another call
     result2 = await analyzer.analyze_code_segment("def test2(): pass")
     assert mock_handler.call_count == 2, "Reset should allow new call"
     assert result2['ai_score'] == 0.8, "Post-reset call should return normal response"
 
-async def test_missing_api_key():
+async def test_rate_limit_waits_for_imminent_tokens(temp_cache_dir, mock_handler, monkeypatch):
+    """Concurrent calls share the bucket and wait for a token that is due soon"""
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    monkeypatch.setenv('MAX_GPT_CALLS', '1')
+    monkeypatch.setenv('GPT_RATE_LIMIT_MAX_WAIT', '0.5')
+    mock_handler.max_calls = 10
+    
+    analyzer = GPTAnalyzer(client=mock_handler)
+    analyzer._bucket.refill_per_sec = 10  # Next token due in 0.1s
+    results = await asyncio.gather(*(analyzer.analyze_code_segment(f"def test{i}(): pass") for i in range(3)))
+    assert [result['ai_score'] for result in results] == [0.8, 0.8, 0.8]
+    
+    analyzer._bucket.refill_per_sec = 0.1  # Next token due in 10s, past the maximum wait
+    analyzer._bucket.tokens = 0
+    result = await analyzer.analyze_code_segment("def late(): pass")
+    assert result['ai_score'] == 0.5, "Calls whose token is not due soon should fall back"
+
+async def test_analyze_many_bounds_requests_in_flight(temp_cache_dir, monkeypatch):
+    """Concurrent analyses never hold more than MAX_INFLIGHT requests open"""
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    monkeypatch.setenv('MAX_GPT_CALLS', '10')
+    monkeypatch.setenv('MAX_INFLIGHT', '2')
+    in_flight = []
+    peak = 0
+    
+    async def create(model, messages, **kwargs):
+        nonlocal peak
+        in_flight.append(messages)
+        peak = max(peak, len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(messages)
+        return MockResponse([MockChoice(MockMessage(json.dumps({'ai_score': 0.8})))])
+    
+    analyzer = GPTAnalyzer()
+    analyzer.client = MagicMock()
+    analyzer.client.chat.completions.create = create
+    results = await analyzer.analyze_many([(f"def test{i}(): pass", "") for i in range(5)])
+    
+    assert [result['ai_score'] for result in results] == [0.8] * 5
+    assert peak == 2
+
+async def test_concurrent_identical_calls_share_one_request(temp_cache_dir, monkeypatch):
+    """Identical cache misses in flight at once are sent once and share the result"""
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    monkeypatch.setenv('MAX_GPT_CALLS', '10')
+    requests = []
+    
+    async def create(model, messages, **kwargs):
+        requests.append(messages)
+        await asyncio.sleep(0.01)
+        reply = {'ai_score': 0.8, 'analysis': {'ai_score': 0.8}, 'verification': {'is_real_ai': True},
+                 'originality': {'originality_score': 0.9}}
+        return MockResponse([MockChoice(MockMessage(json.dumps(reply)))])
+    
+    analyzer = GPTAnalyzer()
+    analyzer.client = MagicMock()
+    analyzer.client.chat.completions.create = create
+    code = "import torch"
+    results = await asyncio.gather(
+        analyzer.analyze_code_segment(code),
+        analyzer.analyze_code_segments([code, code]),
+        analyzer.verify_ai_implementation(code),
+        analyzer.verify_ai_implementation(code=code),
+    )
+    
+    assert results[0]['ai_score'] == 0.8
+    assert [result['ai_score'] for result in results[1]] == [0.8, 0.8]
+    assert results[2] == results[3] == {'is_real_ai': True}
+    assert len(requests) == 2
+    assert not analyzer._inflight
+
+async def test_analyze_full_answers_every_view_with_one_request(temp_cache_dir, mock_handler, monkeypatch):
+    """One combined request fills the analysis, verification and originality caches"""
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    mock_handler.max_calls = 10
+    requests = []
+    
+    async def create(model, messages, **kwargs):
+        requests.append(messages)
+        reply = {
+            'analysis': {'ai_score': 0.7, 'findings': ["Trains a model"]},
+            'verification': {'is_real_ai': True, 'confidence': 0.9},
+            'originality': {'originality_score': 0.6, 'is_likely_copied': False},
+        }
+        return MockResponse([MockChoice(MockMessage(json.dumps(reply)))])
+    
+    mock_handler.chat.completions.create = create
+    analyzer = GPTAnalyzer(client=mock_handler)
+    code = "model.fit(x, y)"
+    
+    full = await analyzer.analyze_full(code)
+    assert len(requests) == 1
+    assert requests[0][1]['content'].count(code) == 1
+    assert full['analysis']['ai_score'] == 0.7
+    assert full['analysis']['quality_score'] == 0.5
+    
+    assert await analyzer.verify_ai_implementation(code) == full['verification']
+    assert await analyzer.check_code_originality(code) == full['originality']
+    assert (await analyzer.analyze_code_segment(code))['ai_score'] == 0.7
+    assert len(requests) == 1
+
+async def test_requests_use_configured_model_and_json_mode(temp_cache_dir, mock_handler, monkeypatch):
+    """Every request names GPT_MODEL and asks for a JSON object reply"""
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    monkeypatch.setenv('GPT_MODEL', 'gpt-4.1-mini')
+    mock_handler.max_calls = 10
+    requests = []
+    
+    async def create(**kwargs):
+        requests.append(kwargs)
+        return MockResponse([MockChoice(MockMessage(json.dumps({'ai_score': 0.8})))])
+    
+    mock_handler.chat.completions.create = create
+    analyzer = GPTAnalyzer(client=mock_handler)
+    await analyzer.analyze_code_segment("import torch")
+    analyzer.queue_ai_verification("import torch")
+    
+    assert requests[0]['model'] == 'gpt-4.1-mini'
+    assert requests[0]['response_format'] == {'type': 'json_object'}
+    batch_body = next(iter(analyzer._batch_requests.values()))['body']
+    assert batch_body['model'] == 'gpt-4.1-mini'
+    assert batch_body['response_format'] == {'type': 'json_object'}
+
+async def test_missing_api_key(monkeypatch):
     """Test that analyzer fails gracefully without API key"""
-    if 'OPENAI_API_KEY' in os.environ:
-        del os.environ['OPENAI_API_KEY']
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
     
     with pytest.raises(ValueError, match="OpenAI API key not found"):
         GPTAnalyzer()
 
-async def test_gpt_error_handling(temp_cache_dir, mock_handler):
+async def test_gpt_error_handling(temp_cache_dir, mock_handler, monkeypatch):
     """Test handling of GPT API errors"""
     # Setup
-    os.environ['OPENAI_API_KEY'] = 'test-key'
-    os.environ['GPT_ANALYSIS_CACHE_PATH'] = temp_cache_dir
-    os.environ['MAX_GPT_CALLS'] = '5'
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    monkeypatch.setenv('MAX_GPT_CALLS', '5')
     
-    analyzer = GPTAnalyzer()
+    analyzer = GPTAnalyzer(client=mock_handler)
     
     # Make GPT call fail
     mock_handler.set_error_mode(True, "API Error")
@@ -263,3 +345,124 @@ async def test_gpt_error_handling(temp_cache_dir, mock_handler):
     result = await analyzer.analyze_code_segment("def test(): pass")
     assert result['ai_score'] == 0.5, "Error should trigger fallback score"
     assert "GPT analysis failed" in result['findings'][0], "Error should be reported in findings"
+
+class MockBatchClient:
+    """Mock of the OpenAI files and batches endpoints used by the Batch API methods"""
+    def __init__(self):
+        self.uploads = []
+        self.polls = 0
+        self.files = MagicMock()
+        self.files.create = self.create_file
+        self.files.content = self.file_content
+        self.batches = MagicMock()
+        self.batches.create = AsyncMock(return_value=MagicMock(id="batch-1", status="validating"))
+        self.batches.retrieve = self.retrieve
+        
+    async def create_file(self, file, purpose):
+        self.uploads.append([json.loads(line) for line in file[1].decode().splitlines()])
+        return MagicMock(id="file-in")
+        
+    async def retrieve(self, batch_id):
+        self.polls += 1
+        status = "completed" if self.polls > 1 else "in_progress"
+        return MagicMock(id=batch_id, status=status, output_file_id="file-out")
+        
+    async def file_content(self, file_id):
+        lines = []
+        for request in self.uploads[-1]:
+            code = request['body']['messages'][-1]['content']
+            content = json.dumps({'ai_score': 0.9 if "torch" in code else 0.1})
+            lines.append(json.dumps({
+                'custom_id': request['custom_id'],
+                'response': {'status_code': 200, 'body': {'choices': [{'message': {'content': content}}]}},
+            }))
+        return MagicMock(text="\n".join(lines))
+
+async def test_analyze_batch(temp_cache_dir, monkeypatch):
+    """Segments are scored by one polled batch job outside the rate limit, honouring the cache"""
+    from analyzer import gpt_analyzer
+    monkeypatch.setattr(gpt_analyzer, "BATCH_POLL_BASE_DELAY", 0)
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    monkeypatch.setenv('MAX_GPT_CALLS', '3')
+    
+    analyzer = GPTAnalyzer()
+    analyzer.client = MockBatchClient()
+    segments = ["import torch", "def hello(): pass", "import torch.nn", "x = 1", "import torch"]
+    
+    scores = await analyzer.analyze_batch(segments)
+    assert scores == [0.9, 0.1, 0.9, 0.1, 0.9]
+    assert len(analyzer.client.uploads) == 1 and len(analyzer.client.uploads[0]) == 4
+    assert analyzer.client.polls == 2
+    assert analyzer._bucket.tokens == 3
+    
+    # Cached segments are not resubmitted
+    assert await analyzer.analyze_batch(segments[:3]) == [0.9, 0.1, 0.9]
+    assert len(analyzer.client.uploads) == 1
+
+async def test_batch_covers_verification_and_originality(temp_cache_dir, monkeypatch):
+    """Queued requests of every kind share one batch and fill the per-kind caches"""
+    from analyzer import gpt_analyzer
+    monkeypatch.setattr(gpt_analyzer, "BATCH_POLL_BASE_DELAY", 0)
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    
+    analyzer = GPTAnalyzer()
+    analyzer.client = MockBatchClient()
+    code = "import torch"
+    keys = [analyzer.queue_code_analysis(code), analyzer.queue_ai_verification(code),
+            analyzer.queue_originality_check(code)]
+    results = await analyzer.collect_batch(await analyzer.submit_batch())
+    
+    assert sorted(results) == sorted(keys)
+    assert len(analyzer.client.uploads) == 1
+    assert await analyzer.verify_ai_implementation(code) == {'ai_score': 0.9}
+    assert await analyzer.submit_batch() is None
+
+async def test_analyze_code_segments(temp_cache_dir, monkeypatch):
+    """Segments share chat completions, demultiplexed by id and cached per segment"""
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    monkeypatch.setenv('MAX_BATCH_SEGMENTS', '2')
+    requests = []
+    
+    async def create(model, messages, **kwargs):
+        user_content = messages[-1]['content']
+        if not user_content.startswith('['):
+            # A lone segment is sent as a plain single-segment request
+            requests.append([user_content])
+            content = {'ai_score': 0.9 if "torch" in user_content else 0.1}
+            return MockResponse([MockChoice(MockMessage(json.dumps(content)))])
+        segments = json.loads(user_content)
+        requests.append(segments)
+        # The reply leaves out the segment with id 1 of the first request
+        results = [{'id': segment['id'], 'ai_score': 0.9 if "torch" in segment['code'] else 0.1}
+                   for segment in segments if len(requests) > 1 or segment['id'] != 1]
+        return MockResponse([MockChoice(MockMessage(json.dumps({'results': results})))])
+    
+    analyzer = GPTAnalyzer()
+    analyzer.client = MagicMock()
+    analyzer.client.chat.completions.create = create
+    segments = ["import torch", "def hello(): pass", "import torch.nn", "x = 1"]
+    
+    results = await analyzer.analyze_code_segments(segments)
+    assert [result['ai_score'] for result in results] == [0.9, 0.5, 0.9, 0.1]
+    assert "No analysis returned" in results[1]['findings'][0]
+    assert [len(segments) for segments in requests] == [2, 2]
+    
+    # Only the segment without an analysis is sent again
+    results = await analyzer.analyze_code_segments(segments)
+    assert [result['ai_score'] for result in results] == [0.9, 0.1, 0.9, 0.1]
+    assert len(requests) == 3
+
+async def test_analyze_full_fallbacks_keep_the_failure_reason(temp_cache_dir, mock_handler, monkeypatch):
+    """Every part of a failed combined request records why it fell back"""
+    monkeypatch.setenv('GPT_ANALYSIS_CACHE_PATH', temp_cache_dir)
+    async def create(model, messages, **kwargs):
+        raise ConnectionError("API Error")
+    
+    mock_handler.chat.completions.create = create
+    analyzer = GPTAnalyzer(client=mock_handler)
+    
+    full = await analyzer.analyze_full("def test(): pass")
+    
+    assert "API Error" in full['analysis']['findings'][0]
+    assert "API Error" in full['verification']['evidence'][0]
+    assert "API Error" in full['originality']['recommendations'][0]
@@ -1,23 +1,28 @@
 import pytest
-from unittest.mock import MagicMock, AsyncMock
+from types import SimpleNamespace
 from analyzer.market_analyzer import MarketAnalyzer
 from analyzer.code_analyzer import AnalysisResult
 from analyzer.report_generator import ReportGenerator
-from analyzer.gpt_analyzer import GPTAnalyzer
+
+# Market context every mock_gpt_analyzer returns unless a test replaces it
+MARKET_CONTEXT = {
+    'popularity_score': 0.9,
+    'adoption_score': 0.9,
+    'impact_score': 0.9,
+    'popularity_metrics': {'stars': 5000, 'forks': 500},
+    'community_metrics': {'contributors': 50, 'issues': 200},
+    'market_context': 'High adoption and community engagement',
+    'recommendations': ['Consider enterprise support'],
+    'market_score': 0.9  # Ensure consistent market score
+}
 
 @pytest.fixture
 def mock_gpt_analyzer():
-    mock = MagicMock(spec=GPTAnalyzer)
-    mock.analyze_market_context = AsyncMock(return_value={
-        'popularity_score': 0.9,
-        'adoption_score': 0.9,
-        'impact_score': 0.9,
-        'popularity_metrics': {'stars': 5000, 'forks': 500},
-        'community_metrics': {'contributors': 50, 'issues': 200},
-        'market_context': 'High adoption and community engagement',
-        'recommendations': ['Consider enterprise support'],
-        'market_score': 0.9  # Ensure consistent market score
-    })
+    """GPT analyzer stub whose analyze_market_context returns its market_context"""
+    async def analyze_market_context(project_name, repo_url):
+        return mock.market_context
+    
+    mock = SimpleNamespace(market_context=MARKET_CONTEXT, analyze_market_context=analyze_market_context)
     return mock
 
 @pytest.fixture
@@ -45,6 +50,13 @@ async def test_market_score_calculation(market_analyzer, mock_gpt_response):
     assert score > 0.8, "Popular project should have high market score"
     assert score <= 1.0, "Market score should be normalized to 1.0"
 
+@pytest.mark.asyncio
+async def test_non_numeric_market_data_falls_back(market_analyzer, mock_gpt_analyzer, mock_gpt_response):
+    """Malformed scores reach the analyze_market_value fallback instead of a silent 0.5"""
+    mock_gpt_analyzer.market_context = dict(mock_gpt_response, adoption_score="high")
+    result = await market_analyzer.analyze_market_value("project", "https://github.com/user/project")
+    assert result == market_analyzer._get_fallback_analysis()
+
 @pytest.mark.asyncio
 async def test_minimum_score_threshold(market_analyzer):
     """Test minimum score threshold for popular projects"""
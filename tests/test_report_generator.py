@@ -0,0 +1,26 @@
+import pytest
+from analyzer import report_generator
+from analyzer.code_analyzer import AnalysisResult
+from analyzer.report_generator import ReportGenerator
+
+# Results covering the popular-project override, perfect, market-only and partial scores
+RESULTS = [
+    AnalysisResult(0.3, 0.4, 0.3, 0.3, 0.9, recommendations=["Add tests"]),
+    AnalysisResult(1.0, 1.0, 1.0, 1.0, 1.0),
+    AnalysisResult(0.0, 0.0, 0.0, 0.0, 1.0),
+    AnalysisResult(0.0, 0.6, 0.0, 0.2, 0.8),
+    AnalysisResult(0.7, 0.1, 0.5, 0.0, 0.2),
+]
+
+def test_generate_summaries_match_generate_summary(monkeypatch):
+    """Batch summaries equal one generate_summary call per result"""
+    monkeypatch.setattr(report_generator, "VECTORIZE_MIN_RESULTS", 10**9)
+    reports = ReportGenerator.generate_summaries(RESULTS)
+    assert reports == [ReportGenerator(result).generate_summary() for result in RESULTS]
+
+def test_vectorized_summaries_match_generate_summary(monkeypatch):
+    """The numpy path for large batches scores exactly like generate_summary"""
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(report_generator, "VECTORIZE_MIN_RESULTS", 0)
+    reports = ReportGenerator.generate_summaries(RESULTS)
+    assert reports == [ReportGenerator(result).generate_summary() for result in RESULTS]
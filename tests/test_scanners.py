@@ -0,0 +1,62 @@
+import pytest
+from analyzer import _scanners
+
+def naive_comment_lines(content: str):
+    """Reference line counts, as the quality analyzers originally computed them"""
+    lines = content.split('\n')
+    comment_lines = [l for l in lines if l.strip().startswith('//') or l.strip().startswith('/*')]
+    doc_lines = [l for l in lines if l.strip().startswith('///')]
+    return len(lines), len(comment_lines), len(doc_lines)
+
+@pytest.mark.parametrize("content", [
+    "",
+    "fn main() {}\n",
+    "let half = total / 2;\nlet url = path + '/' + name; /\n",
+    "/// Docs\n// comment\n  /* block */\nlet x = 1; // trailing\n",
+    "\t\x0b// odd blanks\n\x1c/* file separator */\n",
+    " // non-breaking space\n　/// ideographic space\n",
+    "/\n*\n//\n",
+])
+def test_count_comment_lines_matches_naive_scan(content):
+    assert _scanners.count_comment_lines(content) == naive_comment_lines(content)
+
+@pytest.mark.parametrize("content", [
+    "",
+    "x = 1\n",
+    "# comment only\n\nimport os  # trailing\n",
+    "if x: return 0\nelse:\n    pass\n",
+    "a = 1; b = 2;\nd = {'k': 1}\nx: int = 3\n",
+    'def f():\n    """Doc\n    # not a comment\n    """\n    return [\n        1,  # one\n        2,\n    ]\n',
+    "class A(\n    Base,\n): pass\n",
+    "value = 1 + \\\n    2\n",
+])
+def test_python_line_metrics_match_radon(content):
+    from radon.raw import analyze
+    raw = analyze(content)
+    assert _scanners.python_line_metrics(content) == (raw.lloc, raw.comments)
+
+@pytest.mark.skipif(_scanners.hyperscan is None, reason="hyperscan not installed")
+def test_pattern_set_hyperscan_matches_re_backend(monkeypatch):
+    from analyzer import code_analyzer, execution_verifier
+    content = b"""
+import torch
+class Net(torch.nn.Module):
+    def forward(self, x):
+        eval(x)
+        return model.predict(x, batch_size=8)
+API_KEY = "secret"
+"""
+    pattern_sets = [code_analyzer._SECURITY_PATTERN_SET, execution_verifier.MODEL_INIT_PATTERNS,
+                    execution_verifier.INFERENCE_PATTERNS, execution_verifier.MODEL_CONFIG_PATTERNS]
+    accelerated = [pattern_set.matches(content) for pattern_set in pattern_sets]
+    for pattern_set in pattern_sets:
+        monkeypatch.setattr(pattern_set, "_database", None)
+    assert [pattern_set.matches(content) for pattern_set in pattern_sets] == accelerated
+    assert all(accelerated)
+
+def test_iter_source_files_prunes_skip_dirs(tmp_path):
+    for name in ("app.py", "notes.txt", "pkg/lib.rs", "node_modules/dep.js", "pkg/.venv/site.py"):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("x\n")
+    found = {entry.path for entry in _scanners.iter_source_files(str(tmp_path), {'.py', '.rs', '.js'})}
+    assert found == {str(tmp_path / "app.py"), str(tmp_path / "pkg" / "lib.rs")}